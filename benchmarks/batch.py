@@ -0,0 +1,65 @@
+# Batch orders
+# ============
+#
+# Rebalances a 100-symbol synthetic panel to random target weights, once
+# with one Strategy.market_order call per symbol (sizing in Python) and once
+# with rebalance_to_weights (NumPy sizing, one validated order_batch call).
+# Only the order placement is timed; both paths place the same orders.
+#
+# Usage: python benchmarks/batch.py
+
+import time
+import numpy as np
+import pandas as pd
+from overfitting.broker import Broker
+from overfitting.data import MultiCurrency
+from overfitting.types import OrderType
+
+SYMBOLS = 100
+BARS = 2_000
+REBALANCES = 500
+
+
+def make_data() -> MultiCurrency:
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2024-01-01", periods=BARS, freq="h")
+    frames = {}
+    for k in range(SYMBOLS):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, BARS)))
+        open = np.r_[close[0], close[:-1]]
+        frames[f"S{k:03d}"] = pd.DataFrame({"open": open, "high": np.maximum(open, close),
+                                           "low": np.minimum(open, close), "close": close}, index=index)
+    return MultiCurrency(frames, panel=True)
+
+
+def new_broker(data: MultiCurrency) -> Broker:
+    return Broker(data, cash=1_000_000, commission_rate=0.0002,
+                  maint_margin_rate=0.005, maint_amount=0, slippage_model=None)
+
+
+def loop(broker: Broker, symbols: list, w: np.ndarray):
+    for symbol, weight in zip(symbols, w):
+        open = broker._open(symbol, broker._i)
+        qty = weight * broker.equity / open - broker.get_position(symbol).qty
+        if qty:
+            broker.order(symbol, float(qty), None, type=OrderType.MARKET)
+
+
+def batch(broker: Broker, symbols: list, w: np.ndarray):
+    broker.rebalance_to_weights(w, symbols)
+
+
+if __name__ == "__main__":
+    data = make_data()
+    symbols = list(data.symbols)
+    weights = np.random.default_rng(1).normal(0, 1, (REBALANCES, SYMBOLS))
+    weights /= np.abs(weights).sum(axis=1, keepdims=True)
+
+    for name, place in (("market_order loop", loop), ("rebalance_to_weights", batch)):
+        broker = new_broker(data)
+        start = time.perf_counter()
+        for w in weights:
+            place(broker, symbols, w)
+        elapsed = time.perf_counter() - start
+        n = sum(len(orders) for orders in broker.open_orders.values())
+        print(f"{name:>22}: {elapsed / REBALANCES * 1e6:.0f} us/rebalance, {n} orders")
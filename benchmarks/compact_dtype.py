@@ -0,0 +1,70 @@
+# Compact dtype check
+# ============
+#
+# Runs the hourly BTC SMA crossover once on native (float64) data and once on
+# Data(df, dtype="compact"), then
+# - prints the bytes saved per column
+# - checks that every fill price stays within COMPACT_RTOL of the float64 run
+#
+# Usage: python benchmarks/compact_dtype.py
+
+import os
+import numpy as np
+import pandas as pd
+from overfitting import Strategy
+from overfitting.data import Data, COMPACT_RTOL
+from overfitting.indicators import SMA
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "examples", "data", "BTCUSDT.csv")
+
+
+def load_data() -> pd.DataFrame:
+    df = pd.read_csv(DATA_PATH)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df.set_index("timestamp")
+
+
+class SmaCross(Strategy):
+    def init(self):
+        self.asset = "BTC"
+        self.sma_short = SMA(self, self.asset, source="close", window=20)
+        self.sma_long = SMA(self, self.asset, source="close", window=50)
+
+    def next(self, i):
+        if i == 0 or pd.isna(self.sma_long[i - 1]):
+            return
+
+        position = self.get_position(self.asset)
+        crossed_up = self.sma_short[i - 1] <= self.sma_long[i - 1] and self.sma_short[i] > self.sma_long[i]
+        crossed_down = self.sma_short[i - 1] >= self.sma_long[i - 1] and self.sma_short[i] < self.sma_long[i]
+
+        if crossed_up and position.qty == 0:
+            open_price = self.open(self.asset, i)
+            self.limit_order(self.asset, self.get_balance() // open_price, open_price)
+
+        if crossed_down and position.qty > 0:
+            self.market_order(self.asset, -position.qty)
+
+
+if __name__ == "__main__":
+    df = load_data()
+    native = Data(df)
+    compact = Data(df, dtype="compact", downcast="auto")
+
+    usage = compact.memory_usage()
+    print(usage)
+    print(f"Native bytes: {native.memory_usage()['bytes'].sum():,}")
+    print(f"Compact bytes: {usage['bytes'].sum():,} (saved {usage['saved'].sum():,})")
+
+    a = SmaCross(native)
+    a.run()
+    b = SmaCross(compact)
+    b.run()
+
+    ta, tb = a.fetch_trades(), b.fetch_trades()
+    assert len(ta) == len(tb), f"fill count differs: {len(ta)} vs {len(tb)}"
+
+    rel = np.abs(tb["executed_price"].to_numpy() - ta["executed_price"].to_numpy()) / ta["executed_price"].abs().to_numpy()
+    print(f"Fills: {len(ta)}, max relative price error: {rel.max():.3e} (tolerance {COMPACT_RTOL:.0e})")
+    assert rel.max() <= COMPACT_RTOL
+    assert (ta["qty"].to_numpy() == tb["qty"].to_numpy()).all()
@@ -0,0 +1,52 @@
+# Order throughput
+# ============
+#
+# Places and cancels limit orders straight through Broker.order on the hourly
+# BTC data and reports orders/sec and bytes per resting Order. Orders and
+# positions are slotted and numbered by a per-broker counter, and OrderType
+# arguments skip string parsing.
+#
+# Usage: python benchmarks/orders.py
+
+import os
+import time
+import tracemalloc
+import pandas as pd
+from overfitting.broker import Broker
+from overfitting.data import Data
+from overfitting.types import OrderType
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "examples", "data", "BTCUSDT.csv")
+N = 200_000
+
+
+def load_data() -> pd.DataFrame:
+    df = pd.read_csv(DATA_PATH)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df.set_index("timestamp")
+
+
+def new_broker(data: Data) -> Broker:
+    return Broker(data, cash=1_000_000, commission_rate=0.0002,
+                  maint_margin_rate=0.005, maint_amount=0, slippage_model=None)
+
+
+if __name__ == "__main__":
+    data = Data(load_data())
+
+    for label, type in (("OrderType", OrderType.LIMIT), ("str", "LIMIT")):
+        broker = new_broker(data)
+        start = time.perf_counter()
+        for k in range(N):
+            order = broker.order("BTC", 0.01, 1000.0 + k % 100, type=type)
+            broker.cancel_order("BTC", order.id)
+        elapsed = time.perf_counter() - start
+        print(f"order + cancel ({label} type): {N / elapsed:,.0f} orders/sec")
+
+    broker = new_broker(data)
+    tracemalloc.start()
+    for k in range(N):
+        broker.order("BTC", 0.01, 1000.0 + k % 100, type=OrderType.LIMIT)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"resting orders: {N:,}, {current / N:.0f} bytes/order (incl. book and open_orders entries)")
@@ -0,0 +1,62 @@
+# Timestamp overhead
+# ============
+#
+# The broker keeps bar times as int64 ns and order creation bars as ints;
+# pd.Timestamp objects are only built when fetch_trades() materializes output.
+# This benchmark
+# - times the per-call cost of the old pd.to_datetime(data.index[i]) stamp
+#   against the int64 lookup that replaced it
+# - runs an order-heavy strategy (a new limit order every bar, a fill every
+#   few bars) and reports the per-bar cost of Strategy.run
+#
+# Usage: python benchmarks/timestamps.py
+
+import os
+import time
+import timeit
+import numpy as np
+import pandas as pd
+from overfitting import Strategy
+from overfitting.data import Data
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "examples", "data", "BTCUSDT.csv")
+
+
+def load_data() -> pd.DataFrame:
+    df = pd.read_csv(DATA_PATH)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df.set_index("timestamp")
+
+
+class OrderHeavy(Strategy):
+    def init(self):
+        self.asset = "BTC"
+
+    def next(self, i):
+        # One resting limit order per bar, crossed and filled now and then
+        self.cancel_all_orders(self.asset)
+        position = self.get_position(self.asset)
+        open_price = self.open(self.asset, i)
+        offset = 0.999 if i % 3 else 1.001
+        self.limit_order(self.asset, 0.01 if position.qty <= 0 else -0.01, open_price * offset)
+
+
+if __name__ == "__main__":
+    data = Data(load_data())
+    n = 100_000
+    t = data.index.view("i8")
+
+    old = timeit.timeit(lambda: pd.to_datetime(data.index[1000]), number=n) / n
+    new = timeit.timeit(lambda: int(t[1000]), number=n) / n
+    print(f"pd.to_datetime(index[i]): {old * 1e6:.2f} us/call")
+    print(f"int(index_ns[i]):         {new * 1e6:.2f} us/call ({old / new:.0f}x)")
+
+    strategy = OrderHeavy(data)
+    start = time.perf_counter()
+    strategy.run()
+    elapsed = time.perf_counter() - start
+    print(f"Bars: {data.n}, fills: {len(strategy.broker.trades)}, "
+          f"{elapsed / data.n * 1e6:.1f} us/bar")
+
+    trades = strategy.fetch_trades()
+    assert np.issubdtype(trades["executed_at"].dtype, np.datetime64)
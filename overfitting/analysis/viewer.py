@@ -4,7 +4,7 @@ import numpy as np
 import plotly.graph_objects as go
 
 from overfitting import Strategy
-from overfitting.data import MultiCurrency
+from overfitting.data import MultiCurrency, locate_many
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -105,11 +105,10 @@ class TradeBuilder:
     @classmethod
     def from_strategy(cls, strategy, symbol: str | None = None) -> pd.DataFrame:
         """Return the full trade log as a normalised DataFrame."""
-        raw = strategy.broker.trades
-        if not raw:
+        if not len(strategy.broker.trade_log):
             return pd.DataFrame(columns=cls.COLUMNS)
 
-        df = pd.DataFrame(raw)
+        df = strategy.fetch_trades()
         for col in ("created_at", "executed_at"):
             if col in df.columns:
                 df[col] = pd.to_datetime(df[col], errors="coerce")
@@ -231,7 +230,7 @@ class CandleChartWidget(QWidget):
             if pd.isna(ts):
                 src = base_df.iloc[:self._MAX_CANDLES].copy()
             else:
-                idx = (base_df["timestamp"] - ts).abs().idxmin()
+                idx = int(locate_many(base_df["timestamp"].to_numpy(dtype="datetime64[ns]"), ts, "nearest")[0])
                 left = max(0, idx - self._HALF_WINDOW)
                 right = min(len(base_df), idx + self._HALF_WINDOW)
                 src = base_df.iloc[left:right].copy()
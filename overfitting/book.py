@@ -0,0 +1,171 @@
+import heapq
+from typing import Dict, List, Tuple
+from overfitting.order import Order
+from overfitting.types import OrderType
+
+# Rebuild the heaps once cancelled entries outnumber live ones (and at least this many)
+COMPACT_MIN_DEAD = 64
+
+class OrderBook:
+    """
+    Resting orders of one symbol, keyed by price so a bar only touches the
+    orders its range can fill:
+
+        buy limits   max-heap on price       crossed when low < price
+        sell limits  min-heap on price       crossed when high > price
+        buy stops    min-heap on stop_price  triggered when high >= stop_price
+        sell stops   max-heap on stop_price  triggered when low <= stop_price
+        market       queue                   filled on the next tradable bar
+
+    Triggered stop-limit orders move into the limit heaps and re-priced
+    (trailing) stops are pushed again. Stale and cancelled entries are deleted
+    lazily: every push gets a new token and only the order's latest token is
+    live, until popped or compacted. crossed() hands orders back sorted by
+    placement sequence, exactly as a scan over Broker.open_orders would.
+    """
+
+    def __init__(self):
+        self._buy_limits: List[Tuple[float, int, Order]] = []
+        self._sell_limits: List[Tuple[float, int, Order]] = []
+        self._buy_stops: List[Tuple[float, int, Order]] = []
+        self._sell_stops: List[Tuple[float, int, Order]] = []
+        self._market: List[Tuple[int, Order]] = []
+        self._live: Dict[int, int] = {}  # order id -> token of its live entry
+        self._seq: Dict[int, int] = {}   # order id -> placement sequence
+        self._next_seq = 0
+        self._next_token = 0
+        self._dead = 0
+
+    def __repr__(self):
+        return (f"OrderBook("
+                f"live={len(self._live)}, "
+                f"dead={self._dead})")
+
+    def __len__(self):
+        return len(self._live)
+
+    def add(self, order: Order):
+        self._seq[order.id] = self._next_seq
+        self._next_seq += 1
+        self._push(order)
+
+    def _push(self, order: Order):
+        token = self._next_token
+        self._next_token += 1
+        self._live[order.id] = token
+
+        if order.type == OrderType.MARKET:
+            self._market.append((token, order))
+        elif order.type == OrderType.LIMIT or order.is_triggered:
+            if order.qty > 0:
+                heapq.heappush(self._buy_limits, (-order.price, token, order))
+            else:
+                heapq.heappush(self._sell_limits, (order.price, token, order))
+        elif order.qty > 0:
+            heapq.heappush(self._buy_stops, (order.stop_price, token, order))
+        else:
+            heapq.heappush(self._sell_stops, (-order.stop_price, token, order))
+
+    def reprice(self, order: Order):
+        """Re-queues a live order after its price / stop_price changed."""
+        if order.id in self._live:
+            self._push(order)
+            self._discarded()
+
+    def discard(self, order: Order):
+        """Removes a cancelled (or externally filled) order."""
+        if self._live.pop(order.id, None) is None:
+            return
+        del self._seq[order.id]
+        self._discarded()
+
+    def _discarded(self):
+        self._dead += 1
+        if self._dead >= COMPACT_MIN_DEAD and self._dead > len(self._live):
+            self._compact()
+
+    def clear(self):
+        self.__init__()
+
+    def _compact(self):
+        live = self._live
+        for name in ("_buy_limits", "_sell_limits", "_buy_stops", "_sell_stops"):
+            heap = [e for e in getattr(self, name) if live.get(e[2].id) == e[1]]
+            heapq.heapify(heap)
+            setattr(self, name, heap)
+        self._market = [e for e in self._market if live.get(e[1].id) == e[0]]
+        self._dead = 0
+
+    def _top(self, heap: list):
+        # Drops stale and cancelled entries off the top; returns the first live one
+        while heap and self._live.get(heap[0][2].id) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def ambiguous(self, high: float, low: float) -> bool:
+        """
+        True when the fill sequence inside [low, high] matters: a stop
+        triggers and another resting order is crossed or triggered too, or the
+        triggered stop is a stop-limit (its limit may only be crossed before
+        the trigger). Cancelled entries deeper in a heap may give a false
+        positive, which only costs an intrabar walk.
+        """
+        buy_stop, sell_stop = self._top(self._buy_stops), self._top(self._sell_stops)
+        buy_hit = buy_stop is not None and high >= buy_stop[0]
+        sell_hit = sell_stop is not None and low <= -sell_stop[0]
+        if not (buy_hit or sell_hit):
+            return False
+        if buy_hit and sell_hit:
+            return True
+
+        heap, hit = (self._buy_stops, lambda e: high >= e[0]) if buy_hit else \
+                    (self._sell_stops, lambda e: low <= -e[0])
+        if heap[0][2].price is not None or any(hit(e) for e in heap[1:3]):
+            return True
+
+        buy_limit, sell_limit = self._top(self._buy_limits), self._top(self._sell_limits)
+        return ((buy_limit is not None and low < -buy_limit[0]) or
+                (sell_limit is not None and high > sell_limit[0]))
+
+    def _pop_while(self, heap: list, crossed, out: list):
+        while heap and crossed(heap[0][0]):
+            _, token, order = heapq.heappop(heap)
+            if self._live.get(order.id) == token:
+                out.append(order)
+
+    def crossed(self, high: float, low: float) -> List[Order]:
+        """
+        Pops every order this bar can fill, in placement order: queued market
+        orders, limits crossed by [low, high], stops triggered by it and
+        stop-limits that are both triggered and crossed. Triggered stop-limits
+        that are not crossed yet move into the limit heaps.
+        """
+        out: List[Order] = []
+        live = self._live
+
+        if self._market:
+            out += [order for token, order in self._market if live.get(order.id) == token]
+            self._market = []
+
+        triggered: List[Order] = []
+        self._pop_while(self._buy_stops, lambda stop: high >= stop, triggered)
+        self._pop_while(self._sell_stops, lambda stop: low <= -stop, triggered)
+        for order in triggered:
+            order.is_triggered = True
+            if order.price is None:   # STOP MARKET
+                out.append(order)
+            elif (order.qty > 0 and low < order.price) or (order.qty < 0 and high > order.price):
+                out.append(order)
+            else:                     # STOP LIMIT waits in the limit heap
+                self._push(order)
+
+        self._pop_while(self._buy_limits, lambda price: low < -price, out)
+        self._pop_while(self._sell_limits, lambda price: high > price, out)
+
+        seq = self._seq
+        if len(out) > 1:
+            out.sort(key=lambda order: seq[order.id])
+        for order in out:
+            del live[order.id]
+            del seq[order.id]
+        return out
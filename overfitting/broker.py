@@ -1,15 +1,32 @@
+import heapq
+import pickle
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional, Union, Tuple
-from overfitting.data import Data, MultiCurrency
+from overfitting.data import Data, MultiCurrency, _as_ns
+from overfitting.chunked import ChunkedData
 from overfitting.order import Order
+from overfitting.book import OrderBook
+from overfitting.tradelog import TradeLog, TradeRecords
+from overfitting.checkpoint import Checkpoint
 from overfitting.position import Position
 from overfitting.slippage import SlippageModel
-from overfitting.types import OrderType
-from overfitting.errors import EmptyOrderParameters, InvalidOrderParameters, LiquidationError, StopOrderRejected
+from overfitting.types import OrderType, Status, TimeInForce
+from overfitting.errors import CheckpointError, EmptyOrderParameters, InvalidOrderParameters, LiquidationError, StopOrderRejected
+
+# Attributes that change while simulating. Data, bar times, the panel,
+# intrabar paths and the slippage model are configuration of the broker
+# a checkpoint is restored into.
+CHECKPOINT_STATE = (
+    "cash", "equity", "margin_used", "exposure", "_i", "_next_id", "_next_group",
+    "position", "open_orders", "_books", "_index", "_active", "_rank",
+    "_slots", "_symbols", "_qty", "_entry", "_margin", "_liq", "_mark", "_rows",
+    "_oco", "_brackets", "_trailing", "_expiries", "trade_log",
+)
 
 class Broker:
     def __init__(self,
-                 data: Union[Data, MultiCurrency], 
+                 data: Union[Data, MultiCurrency, ChunkedData], 
                  cash: float, 
                  commission_rate: float, 
                  maint_margin_rate: float, 
@@ -29,10 +46,49 @@ class Broker:
         #       ethusdt: {"order-id-01": <Order>, "order-id-02": <Order>},
         #   }
         self.open_orders: Dict[str, Dict[str, Order]] = {}
+        # Same orders keyed by price, so next() only visits fillable ones
+        self._books: Dict[str, OrderBook] = {}
+        # Symbols with resting orders or a non-zero position; next() visits
+        # them in the order their book was created (rank)
+        self._active: set = set()
+        self._rank: Dict[str, int] = {}
+        # Secondary indexes of open orders: (field, symbol, value) -> {id: order}
+        # for field in label / side / type, in placement order
+        self._index: Dict[Tuple[str, str, object], Dict[int, Order]] = {}
         self.position: Dict[str, Position] = {} 
+        # Struct-of-arrays mirror of self.position: one slot per symbol, in
+        # position-creation order, so marking to market is a vectorized pass
+        self._slots: Dict[str, int] = {}
+        self._symbols: List[str] = []               # slot -> symbol
+        self._qty = np.zeros(16)
+        self._entry = np.zeros(16)
+        self._margin = np.zeros(16)
+        self._liq = np.zeros(16)
+        self._mark = np.zeros(16)                   # last valid close
+        self._rows = np.zeros(16, dtype=np.intp)    # panel row of each slot
+        self._panel = data.panel if isinstance(data, MultiCurrency) else None
+
+        # Account state marked at the close of the last simulated bar
+        self.equity = self.cash
+        self.margin_used = 0.0
+        self.exposure = 0.0
+
+        self.trade_log = TradeLog()
+        # symbol -> (fine high, fine low, start, end) lower-timeframe path
+        self._intrabar: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+        # Orders resolved inside next(): OCO groups, bracket children to place
+        # on the parent's fill and trailing stops per symbol
+        self._oco: Dict[int, List[Order]] = {}
+        self._brackets: Dict[int, Tuple[Optional[float], Optional[float]]] = {}
+        self._trailing: Dict[str, Dict[int, Order]] = {}
+        self._next_group = 1
+        # (expire bar index, order id, order) min-heap of non-GTC orders
+        self._expiries: List[Tuple[int, int, Order]] = []
 
-        self.trades = []
         self._i = 0
+        self._next_id = 1  # order ids are numbered per run
+        # Bar open times as int64 ns; converted to pd.Timestamp only on output
+        self._t = self.data.index.view("i8")
 
     def __repr__(self):
         return (f"Broker("
@@ -42,42 +98,64 @@ class Broker:
                 f"maint_margin_rate={self.maint_margin_rate}, "
                 f"maint_amount={self.maint_amount}, "
                 f"open_orders={len(self.open_orders)}, "
+                f"active={len(self._active)}, "
                 f"positions={list(self.position.keys())}, "
                 f"trades={len(self.trades)})")
     
+    @property
+    def trades(self) -> TradeRecords:
+        """Fills as a lazy list of dicts (see trade_log for the columnar store)."""
+        return self.trade_log.records()
+
     def _d(self, symbol: str) -> Data:
         return self.data[symbol] if isinstance(self.data, MultiCurrency) else self.data
 
+    # Prices are returned as Python floats so compact (float32) data never
+    # leaks float32 arithmetic into positions and cash
     def _bars(self, symbol: str, i: int) -> Tuple:
         d = self._d(symbol)
-        return d.open[i], d.high[i], d.low[i], d.close[i]
+        return float(d.open[i]), float(d.high[i]), float(d.low[i]), float(d.close[i])
 
     def _open(self, symbol: str, i: int):
-        return self._d(symbol).open[i]
+        return float(self._d(symbol).open[i])
 
     def _high(self, symbol: str, i: int):
-        return self._d(symbol).high[i]
+        return float(self._d(symbol).high[i])
     
     def _low(self, symbol: str, i: int):
-        return self._d(symbol).low[i]
+        return float(self._d(symbol).low[i])
 
     def _close(self, symbol: str, i: int):
-        return self._d(symbol).close[i]
+        return float(self._d(symbol).close[i])
+
+    def _tradable(self, symbol: str, i: int) -> bool:
+        # Only aligned MultiCurrency data carries a 'tradable' mask
+        t = self._d(symbol).get("tradable")
+        return True if t is None else bool(t[i])
 
     def order(self, 
               symbol: str, 
               qty: float, 
               price: float, 
               *, 
-              type: str= OrderType.LIMIT, 
+              type: Union[str, OrderType] = OrderType.LIMIT, 
               stop_price: float= None,
-              label: str=None) -> Order:       
+              label: str=None,
+              time_in_force: Union[str, TimeInForce] = TimeInForce.GTC,
+              expire_at=None,
+              expire_bars: int = None) -> Order:       
         """
         :param str symbol: symbol of the market (Mandatory)
         :param float qty: quantity of the trade (negative for short, Mandatory)
         :param float price: price of which to be executed (Mandatory for LIMIT Orders)
         :param str type: 'MARKET' or 'LIMIT' or 'STOP' (By default LIMIT)
         :param float stop_price: stop price for stop orders (Mandatory for STOP orders)
+        :param str time_in_force: 'GTC' (default), 'GTD', 'IOC', 'FOK' or 'GTB'
+            - GTD: live while bar open time < expire_at
+            - GTB: live for expire_bars bars, including the current one
+            - IOC / FOK: must be marketable at the current open, else expires
+              at once; live for the current bar only (no partial fills, so
+              both behave the same)
         """
         if not symbol or not isinstance(symbol, str):
             raise InvalidOrderParameters(f"symbol must be a non-empty string. - {symbol}")
@@ -86,19 +164,14 @@ class Broker:
             raise InvalidOrderParameters(f"qty must be a non-empty float. - {qty}")
 
         if symbol not in self.position:
-            self.position[symbol] = Position(symbol, self.maint_margin_rate, self.maint_amount)
-
-        if symbol not in self.open_orders:
-            self.open_orders[symbol] = {}
+            self._new_position(symbol)
 
-        if type.upper() == "LIMIT":
-            type = OrderType.LIMIT
-        elif type.upper() == "MARKET":
-            type = OrderType.MARKET
-        elif type.upper() == 'STOP':
-            type = OrderType.STOP
-        else:
-            raise InvalidOrderParameters(f"Invalid Order Type - {type}")
+        # Strategy helpers pass OrderType directly; strings are parsed
+        if not isinstance(type, OrderType):
+            try:
+                type = OrderType[type.upper()]
+            except (KeyError, AttributeError):
+                raise InvalidOrderParameters(f"Invalid Order Type - {type}")
         
         if type == OrderType.STOP and stop_price is None:
             raise EmptyOrderParameters("stop_price must be specficed for STOP order")
@@ -106,8 +179,20 @@ class Broker:
         if type == OrderType.LIMIT and price is None:
             raise EmptyOrderParameters("price must be specifed for LIMIT order")
 
-        timestamp = pd.to_datetime(self.data.index[self._i])
-        order = Order(timestamp, symbol, qty, price, type, stop_price, label)
+        # NaN would corrupt the book's heap order (e.g. a masked bar's open)
+        for name, value in (("price", price), ("stop_price", stop_price)):
+            if value is not None and not np.isfinite(value):
+                raise InvalidOrderParameters(f"{name} must be a finite number. - {value}")
+
+        if not isinstance(time_in_force, TimeInForce):
+            try:
+                time_in_force = TimeInForce[time_in_force.upper()]
+            except (KeyError, AttributeError):
+                raise InvalidOrderParameters(f"Invalid Time In Force - {time_in_force}")
+        expire_i = self._expire_index(type, time_in_force, expire_at, expire_bars)
+
+        order = Order(int(self._t[self._i]), symbol, qty, price, type, stop_price, label, self._i, self._new_id())
+        order.time_in_force, order.expire_i = time_in_force, expire_i
 
         if type == OrderType.STOP:
             open = self._open(symbol, self._i)
@@ -117,11 +202,331 @@ class Broker:
                     f"STOP order rejected: stop price {order.stop_price} would trigger immediately at current price {open}."
                 )
     
+        if time_in_force in (TimeInForce.IOC, TimeInForce.FOK) and not self._marketable(order):
+            self._expire(order)
+            return order
+
         # Put new order in the open_orders list if not rejected
+        self._place(order)
+        if expire_i is not None:
+            heapq.heappush(self._expiries, (expire_i, order.id, order))
+        return order
+
+    def _expire_index(self, type: OrderType, tif: TimeInForce, expire_at, expire_bars) -> Optional[int]:
+        """First bar index at which an order placed now is no longer live."""
+        if tif == TimeInForce.GTC:
+            return None
+        if tif in (TimeInForce.IOC, TimeInForce.FOK):
+            if type == OrderType.STOP:
+                raise InvalidOrderParameters(f"{tif.name} is not supported for STOP orders")
+            return self._i + 1
+        if tif == TimeInForce.GTB:
+            if not expire_bars or expire_bars < 1:
+                raise EmptyOrderParameters("expire_bars (>= 1) must be specified for GTB order")
+            return self._i + int(expire_bars)
+
+        if expire_at is None:
+            raise EmptyOrderParameters("expire_at must be specified for GTD order")
+        e = int(np.searchsorted(self._t, _as_ns(expire_at), side="left"))
+        if e <= self._i:
+            raise InvalidOrderParameters(f"expire_at {expire_at} is not after the current bar")
+        return e
+
+    def _marketable(self, order: Order) -> bool:
+        # IOC / FOK: fillable against the current open right now
+        if not self._tradable(order.symbol, self._i):
+            return False
+        if order.type == OrderType.MARKET:
+            return True
+        open = self._open(order.symbol, self._i)
+        return (order.qty > 0 and order.price >= open) or (order.qty < 0 and order.price <= open)
+
+    def _expire(self, order: Order):
+        """Removes an order whose time in force ran out and logs it as EXPIRED."""
+        order.executed_ns = int(self._t[self._i])
+        self.trade_log.append(order, Status.EXPIRED)
+
+        symbol = order.symbol
+        if order.id in self.open_orders.get(symbol, ()):
+            del self.open_orders[symbol][order.id]
+            self._books[symbol].discard(order)
+            self._forget(order)
+            self._touch(symbol)
+
+    def _place(self, order: Order):
+        symbol = order.symbol
+        if symbol not in self.open_orders:
+            self.open_orders[symbol] = {}
+            self._books[symbol] = OrderBook()
+            self._rank[symbol] = len(self._rank)
+
         self.open_orders[symbol][order.id] = order
+        self._books[symbol].add(order)
+        self._active.add(symbol)
+        for key in self._keys(order):
+            self._index.setdefault(key, {})[order.id] = order
+
+    @staticmethod
+    def _keys(order: Order) -> List[Tuple[str, str, object]]:
+        keys = [("side", order.symbol, order.side), ("type", order.symbol, order.type)]
+        if order.label is not None:
+            keys.append(("label", order.symbol, order.label))
+        return keys
+
+    def order_batch(self,
+                    symbols: List[str],
+                    qtys,
+                    prices=None,
+                    types: Union[str, OrderType, List[Union[str, OrderType]]] = OrderType.MARKET,
+                    *,
+                    stop_prices=None,
+                    label: str = None) -> List[Order]:
+        """
+        Places many GTC orders in one call. All rows are validated before any
+        order is placed, so a bad row rejects the whole batch.
+
+        :param list symbols: symbol of each order
+        :param qtys: quantities (negative for short)
+        :param prices: limit prices, NaN / None where unused (Mandatory for LIMIT rows)
+        :param types: one order type for the batch, or one per order (By default MARKET)
+        :param stop_prices: stop prices, NaN / None where unused (Mandatory for STOP rows)
+        """
+        symbols = list(symbols)
+        n = len(symbols)
+        qtys = np.asarray(qtys, dtype=np.float64).reshape(-1)
+        prices = np.full(n, np.nan) if prices is None else np.asarray(prices, dtype=np.float64).reshape(-1)
+        stops = np.full(n, np.nan) if stop_prices is None else np.asarray(stop_prices, dtype=np.float64).reshape(-1)
+        if isinstance(types, (str, OrderType)):
+            types = [types] * n
+        if not len(qtys) == len(prices) == len(stops) == len(types) == n:
+            raise InvalidOrderParameters(
+                f"order_batch arrays must have the same length. - "
+                f"symbols={n}, qtys={len(qtys)}, prices={len(prices)}, "
+                f"stop_prices={len(stops)}, types={len(types)}")
+
+        for symbol in symbols:
+            if not symbol or not isinstance(symbol, str):
+                raise InvalidOrderParameters(f"symbol must be a non-empty string. - {symbol}")
+
+        bad = ~np.isfinite(qtys) | (qtys == 0)
+        if bad.any():
+            raise InvalidOrderParameters(f"qty must be a non-empty float. - {qtys[bad][0]}")
+
+        # Each distinct type is parsed once
+        parsed: Dict[object, OrderType] = {}
+        for t in set(types):
+            if isinstance(t, OrderType):
+                parsed[t] = t
+                continue
+            try:
+                parsed[t] = OrderType[t.upper()]
+            except (KeyError, AttributeError):
+                raise InvalidOrderParameters(f"Invalid Order Type - {t}")
+        types = [parsed[t] for t in types]
+        is_limit = np.fromiter((t is OrderType.LIMIT for t in types), dtype=bool, count=n)
+        is_stop = np.fromiter((t is OrderType.STOP for t in types), dtype=bool, count=n)
+
+        if (is_stop & np.isnan(stops)).any():
+            raise EmptyOrderParameters("stop_price must be specficed for STOP order")
+        if (is_limit & np.isnan(prices)).any():
+            raise EmptyOrderParameters("price must be specifed for LIMIT order")
+        if np.isinf(prices).any() or np.isinf(stops).any():
+            raise InvalidOrderParameters("price and stop_price must be finite numbers.")
+
+        for k in np.flatnonzero(is_stop):
+            open = self._open(symbols[k], self._i)
+            if (qtys[k] > 0 and stops[k] < open) or (qtys[k] < 0 and stops[k] > open):
+                raise StopOrderRejected(
+                    f"STOP order rejected: stop price {stops[k]} would trigger immediately at current price {open}."
+                )
+
+        created_ns = int(self._t[self._i])
+        orders = []
+        for symbol, qty, price, type, stop in zip(symbols, qtys.tolist(), prices.tolist(), types, stops.tolist()):
+            if symbol not in self.position:
+                self._new_position(symbol)
+            order = Order(created_ns, symbol, qty, None if price != price else price, type,
+                          None if stop != stop else stop, label, self._i, self._new_id())
+            self._place(order)
+            orders.append(order)
+        return orders
+
+    def rebalance_to_weights(self,
+                             weights,
+                             symbols: Optional[List[str]] = None,
+                             *,
+                             min_notional: float = 0.0,
+                             label: str = None) -> List[Order]:
+        """
+        Market orders moving each symbol to a target notional of
+        weight * equity at the current open. Weights are signed; an absolute
+        sum above 1 is leverage. Equity is the account marked at the last
+        close; open orders are not netted. Symbols without a tradable price
+        this bar are left alone.
+
+        :param weights: array aligned with symbols, or a {symbol: weight} dict / Series
+        :param list symbols: symbols of the weights (By default every MultiCurrency symbol)
+        :param float min_notional: trades at or below this notional are skipped
+        """
+        if isinstance(weights, (dict, pd.Series)):
+            weights = pd.Series(weights, dtype=np.float64)
+            symbols = list(weights.index)
+        elif symbols is None:
+            if not isinstance(self.data, MultiCurrency):
+                raise InvalidOrderParameters("symbols must be specified for single currency data.")
+            symbols = list(self.data.symbols)
+        w = np.asarray(weights, dtype=np.float64).reshape(-1)
+        if len(w) != len(symbols):
+            raise InvalidOrderParameters(f"weights ({len(w)}) and symbols ({len(symbols)}) must have the same length.")
+        if not np.isfinite(w).all():
+            raise InvalidOrderParameters("weights must be finite.")
+
+        for symbol in symbols:
+            if symbol not in self.position:
+                self._new_position(symbol)
+        slots = np.fromiter((self._slots[s] for s in symbols), dtype=np.intp, count=len(symbols))
+
+        i = self._i
+        if self._panel is not None:
+            rows = self._rows[slots]
+            open = self._panel.open[rows, i].astype(np.float64)
+            if self._panel.tradable is not None:
+                open[~self._panel.tradable[rows, i]] = np.nan
+        else:
+            open = np.array([self._open(s, i) if self._tradable(s, i) else np.nan for s in symbols])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = w * self.equity / open - self._qty[slots]
+            trade = np.isfinite(delta) & (np.abs(delta) * open > min_notional)
+        idx = np.flatnonzero(trade)
+        return self.order_batch([symbols[k] for k in idx], delta[idx], types=OrderType.MARKET, label=label)
+
+    def oco(self, *orders: Order) -> int:
+        """
+        Links open orders into a one-cancels-other group: the first fill
+        cancels the rest. Returns the group id.
+        """
+        if len(orders) < 2:
+            raise InvalidOrderParameters("An OCO group needs at least two orders.")
+        for o in orders:
+            if o.id not in self.open_orders.get(o.symbol, {}):
+                raise InvalidOrderParameters(f"Only open orders can be linked - {o.id}")
+            if o.oco is not None:
+                raise InvalidOrderParameters(f"Order {o.id} already belongs to OCO group {o.oco}")
+
+        group = self._next_group
+        self._next_group += 1
+        for o in orders:
+            o.oco = group
+        self._oco[group] = list(orders)
+        return group
+
+    def bracket(self,
+                symbol: str,
+                qty: float,
+                price: float = None,
+                *,
+                take_profit: float = None,
+                stop_loss: float = None,
+                label: str = None) -> Order:
+        """
+        Entry order (LIMIT at price, or MARKET when price is None) whose fill
+        places a take-profit LIMIT and a stop-loss STOP MARKET for -qty,
+        linked as OCO.
+        :param float take_profit: exit limit price (optional)
+        :param float stop_loss: exit stop price (optional)
+        """
+        if take_profit is None and stop_loss is None:
+            raise EmptyOrderParameters("take_profit or stop_loss must be specified for a bracket order")
+        for name, value in (("take_profit", take_profit), ("stop_loss", stop_loss)):
+            if value is not None and not np.isfinite(value):
+                raise InvalidOrderParameters(f"{name} must be a finite number. - {value}")
+
+        type = OrderType.MARKET if price is None else OrderType.LIMIT
+        parent = self.order(symbol, qty, price, type=type, label=label)
+        self._brackets[parent.id] = (take_profit, stop_loss)
+        return parent
+
+    def _place_children(self, parent: Order, take_profit: Optional[float], stop_loss: Optional[float]):
+        # Children are placed mid-bar: created_i = -1 keeps the
+        # "priced through the open" rule from applying to them, and a stop
+        # already through the market simply triggers on the next check
+        t, children = int(self._t[self._i]), []
+        if take_profit is not None:
+            children.append(Order(t, parent.symbol, -parent.qty, take_profit, OrderType.LIMIT,
+                                  None, parent.label, -1, self._new_id()))
+        if stop_loss is not None:
+            children.append(Order(t, parent.symbol, -parent.qty, None, OrderType.STOP,
+                                  stop_loss, parent.label, -1, self._new_id()))
+        for child in children:
+            self._place(child)
+        if len(children) > 1:
+            self.oco(*children)
+
+    def trailing_stop(self,
+                      symbol: str,
+                      qty: float,
+                      trail: float,
+                      *,
+                      percent: bool = False,
+                      label: str = None) -> Order:
+        """
+        STOP MARKET order whose stop follows the market by `trail`: after each
+        bar a sell stop moves up to high - trail and a buy stop down to
+        low + trail (never back). With percent=True, trail is a fraction.
+        """
+        if trail is None or not np.isfinite(trail) or trail <= 0 or (percent and trail >= 1):
+            raise InvalidOrderParameters(f"Invalid trail - {trail}")
+
+        ref = self._open(symbol, self._i)
+        stop = self._trail_stop(qty, trail, percent, ref)
+        order = self.order(symbol, qty, None, type=OrderType.STOP, stop_price=stop, label=label)
+        order.trail, order.trail_percent = trail, percent
+        self._trailing.setdefault(symbol, {})[order.id] = order
         return order
+
+    @staticmethod
+    def _trail_stop(qty: float, trail: float, percent: bool, ref: float) -> float:
+        if qty < 0: # sell stop trails below the market
+            return ref * (1 - trail) if percent else ref - trail
+        return ref * (1 + trail) if percent else ref + trail
+
+    def _trail(self, symbol: str, trailing: Dict[int, Order], high: float, low: float):
+        book = self._books[symbol]
+        for order in trailing.values():
+            stop = self._trail_stop(order.qty, order.trail, order.trail_percent, high if order.qty < 0 else low)
+            if (order.qty < 0 and stop > order.stop_price) or (order.qty > 0 and stop < order.stop_price):
+                order.stop_price = stop
+                book.reprice(order)
+
+    def _forget(self, order: Order):
+        """Drops index / OCO / bracket / trailing bookkeeping of an order leaving the book."""
+        for key in self._keys(order):
+            bucket = self._index.get(key)
+            if bucket is not None:
+                bucket.pop(order.id, None)
+                if not bucket:
+                    del self._index[key]
+
+        self._brackets.pop(order.id, None)
+        trailing = self._trailing.get(order.symbol)
+        if trailing:
+            trailing.pop(order.id, None)
+
+        members = self._oco.get(order.oco)
+        if members is not None:
+            members.remove(order)
+            if len(members) < 2:
+                for m in members:
+                    m.oco = None
+                del self._oco[order.oco]
     
-    def cancel_order(self, symbol, order_id: str) -> Optional[Order]:
+    def _new_id(self) -> int:
+        i = self._next_id
+        self._next_id += 1
+        return i
+
+    def cancel_order(self, symbol, order_id: int) -> Optional[Order]:
         if symbol not in self.open_orders:
             return None
         
@@ -130,6 +535,9 @@ class Broker:
 
         order = self.open_orders[symbol][order_id]
         del self.open_orders[symbol][order_id]
+        self._books[symbol].discard(order)
+        self._forget(order)
+        self._touch(symbol)
 
         return order
 
@@ -139,23 +547,91 @@ class Broker:
 
         orders = self.open_orders[symbol]
         for order_id in list(orders.keys()):
-            del orders[order_id]
+            self._forget(orders.pop(order_id))
+        self._books[symbol].clear()
+        self._touch(symbol)
+
+    def cancel_by_label(self, symbol: str, label: str) -> List[Order]:
+        """Cancels the open orders of a symbol tagged with label. Returns them."""
+        orders = list(self._index.get(("label", symbol, label), {}).values())
+        for order in orders:
+            self.cancel_order(symbol, order.id)
+        return orders
+
+    def get_orders_by_label(self, symbol: str, label: str) -> Dict[int, Order]:
+        return dict(self._index.get(("label", symbol, label), {}))
+
+    def get_orders_by_side(self, symbol: str, side: str) -> Dict[int, Order]:
+        """:param str side: 'LONG' or 'SHORT'"""
+        return dict(self._index.get(("side", symbol, side.upper()), {}))
+
+    def get_orders_by_type(self, symbol: str, type: Union[str, OrderType]) -> Dict[int, Order]:
+        if not isinstance(type, OrderType):
+            try:
+                type = OrderType[type.upper()]
+            except (KeyError, AttributeError):
+                raise InvalidOrderParameters(f"Invalid Order Type - {type}")
+        return dict(self._index.get(("type", symbol, type), {}))
+
+    def attach_intrabar(self, symbol: str, fine: Union[pd.DataFrame, Data]):
+        """
+        Resolves ambiguous bars of `symbol` (see OrderBook.ambiguous) against
+        lower-timeframe bars, e.g. 1-minute data under hourly bars. Fine bars
+        in [start[i], end[i]) are those inside base bar i; offsets are
+        precomputed once. Bars without fine data stay bar-level.
+        """
+        fine = fine if isinstance(fine, Data) else Data(fine)
+        t = self._d(symbol).index.view("i8")
+        f = fine.index.view("i8")
+
+        step = int(np.median(np.diff(t))) if len(t) > 1 else 0
+        start = np.searchsorted(f, t, side="left")
+        end = np.empty_like(start)
+        end[:-1] = start[1:]
+        end[-1] = np.searchsorted(f, t[-1] + step, side="left")
+
+        self._intrabar[symbol] = (np.asarray(fine.high, dtype=np.float64),
+                                  np.asarray(fine.low, dtype=np.float64), start, end)
 
     def get_position(self, symbol: str) -> Position:
         if symbol not in self.position:
-            self.position[symbol] = Position(symbol, self.maint_margin_rate, self.maint_amount)
+            self._new_position(symbol)
             
         return self.position[symbol]
+
+    def _new_position(self, symbol: str):
+        k = len(self._slots)
+        if k == len(self._qty):
+            for name in ("_qty", "_entry", "_margin", "_liq", "_mark", "_rows"):
+                a = getattr(self, name)
+                setattr(self, name, np.concatenate([a, np.zeros_like(a)]))
+
+        self._slots[symbol] = k
+        self._symbols.append(symbol)
+        if self._panel is not None:
+            self._rows[k] = self._panel.symbol_index[symbol]
+        self.position[symbol] = Position(symbol, self.maint_margin_rate, self.maint_amount)
+
+    def _sync(self, position: Position):
+        k = self._slots[position.symbol]
+        if self._qty[k] == 0 and position.qty != 0:
+            # Flat slots are not marked; start from the entry until a close is seen
+            self._mark[k] = position.price
+        self._qty[k] = position.qty
+        self._entry[k] = position.price
+        self._margin[k] = position.margin
+        self._liq[k] = position.liquid_price
     
     def close_all_positions(self, symbol: str):
         position = self.get_position(symbol)
         
         if position.qty != 0: # Open position
-            self.order(symbol, -position.qty, None, type="MARKET")      
+            self.order(symbol, -position.qty, None, type=OrderType.MARKET)      
 
     def set_leverage(self, symbol: str, leverage: int):        
         position = self.get_position(symbol)
         position.set_leverage(leverage)
+        self._sync(position)
         # Check if the position would be liquidated with the new leverage
         lp = position.liquid_price
         p = self._open(symbol, self._i)
@@ -185,84 +661,208 @@ class Broker:
         notional = abs(order.qty) * order.executed_price
         commission = notional * self.commission_rate
         pnl = position.process_trade(order, liquidation)
-        executed_time = pd.to_datetime(self.data.index[self._i])
+        self._sync(position)
 
         # Update Order fields as it has been filled
         order.pnl = pnl
-        order.executed_at = executed_time
+        order.executed_ns = int(self._t[self._i])
         order.commission = commission
         order.realized_pnl = pnl - commission
-        self.is_liquidation_order = True if liquidation else False        
+        order.is_liquidation_order = liquidation
 
         # Update trades and balance
-        self.trades.append(order.to_dict())
+        self.trade_log.append(order)
         self.cash += order.realized_pnl   
 
         if symbol in self.open_orders and order.id in self.open_orders[symbol]:
             del self.open_orders[symbol][order.id]
+            self._books[symbol].discard(order)
+
+        if not liquidation:
+            # The first fill of an OCO group cancels the other members
+            group = self._oco.pop(order.oco, None) if order.oco is not None else None
+            for other in group or ():
+                if other is not order:
+                    other.oco = None
+                    self.cancel_order(other.symbol, other.id)
+            order.oco = None
+
+            bracket = self._brackets.pop(order.id, None)
+            if bracket is not None:
+                self._place_children(order, *bracket)
+            self._forget(order)
+        self._touch(symbol)
+
+    def _touch(self, symbol: str):
+        """Re-evaluates whether a symbol belongs to the active set."""
+        book = self._books.get(symbol)
+        if (book is not None and len(book)) or self.position[symbol].qty != 0:
+            self._active.add(symbol)
+        else:
+            self._active.discard(symbol)
+
+    @property
+    def active_count(self) -> int:
+        """Number of symbols with resting orders or an open position."""
+        return len(self._active)
+
+    def _symbol_set(self) -> Optional[Tuple[str, ...]]:
+        return tuple(sorted(self.data.symbols)) if isinstance(self.data, MultiCurrency) else None
+
+    def checkpoint(self, user=None, curve: Optional[np.ndarray] = None) -> Checkpoint:
+        """
+        Snapshot of the state between two bars. Orders, positions, the
+        structures referencing them and the logged fills are pickled
+        together, so shared references survive.
+
+        :param user: picklable strategy state carried along (see Strategy.get_state)
+        :param np.ndarray curve: recorded account of the bars before it (see Strategy.run)
+        """
+        state = pickle.dumps({k: getattr(self, k) for k in CHECKPOINT_STATE}, protocol=pickle.HIGHEST_PROTOCOL)
+        stamps = (int(self._t[0]), int(self._t[self._i - 1])) if self._i else None
+        return Checkpoint(self._i, state, self._symbol_set(), stamps, user, curve)
+
+    def restore(self, checkpoint: Checkpoint):
+        """
+        Rewinds to a checkpoint, taken from this broker or from another one
+        over data with the same symbols and the same bars up to checkpoint.i
+        (only the bar count, symbols and first / last bar times are checked).
+        Every order, position and the trade log are fresh copies, so objects
+        held from before the restore are no longer the broker's.
+        """
+        i = checkpoint.i
+        if len(self._t) < i:
+            raise CheckpointError(f"Checkpoint is at bar {i} but the data has only {len(self._t)} bars.")
+        if self._symbol_set() != checkpoint.symbols:
+            raise CheckpointError(f"Checkpoint symbols {checkpoint.symbols} differ from the data's {self._symbol_set()}.")
+        if i and (int(self._t[0]), int(self._t[i - 1])) != checkpoint.stamps:
+            raise CheckpointError(f"Data does not share the bars before checkpoint bar {i}.")
+
+        for k, v in checkpoint.load().items():
+            setattr(self, k, v)
+        # Slot -> panel row of this data, which may order symbols differently
+        if self._panel is not None:
+            for k, symbol in enumerate(self._symbols):
+                self._rows[k] = self._panel.symbol_index[symbol]
 
     def next(self):
         if self._i != 0: # Check Liquidation
-            for s, p in list(self.position.items()):
-                _, prev_high, prev_low, _ = self._bars(s, self._i - 1)
+            for k in self._liquidations():
+                s, p = self._symbols[k], self.position[self._symbols[k]]
                 lp = p.liquid_price
-                # Check Liquidation Condition
-                if ((p.qty > 0 and prev_low <= lp) or 
-                    (p.qty < 0 and prev_high >= lp)):
-                    # Create MARKET Order for liquidation & Execute
-                    order = self.order(p.symbol,  -p.qty, lp, type="MARKET")
-                    self._execute_trade(p.symbol, order, lp, True)
+                # Create MARKET Order for liquidation & Execute
+                # (built directly: it never rests in the book)
+                order = Order(int(self._t[self._i]), s, -p.qty, lp, OrderType.MARKET,
+                              i=self._i, id=self._new_id())
+                self._execute_trade(s, order, lp, True)
                         
-            # 2) Execute open orders (iterate snapshots to avoid mutation issues)
-        for symbol, by_id in list(self.open_orders.items()):
+            # 2) Execute open orders crossed by this bar (in placement order)
+        for symbol in sorted(self._active, key=self._rank.__getitem__):
+            book = self._books[symbol]
+            # No fills on synthetic (aligned) bars
+            if not book or not self._tradable(symbol, self._i):
+                continue
+
             open, high, low, _ = self._bars(symbol, self._i)
 
-            for _, order in list(by_id.items()):
-                # Set market order price and update
-                if order.type == OrderType.MARKET:
-                    # Execute the trade with price being
-                    # open price because its market order
-                    self._execute_trade(symbol, order, open)
-                elif order.type == OrderType.LIMIT:
-                    if ((order.qty > 0 and low < order.price) or 
-                        (order.qty < 0 and high > order.price)):
-                        # If the order just has been created
-                        if order.created_at == pd.to_datetime(self.data.index[self._i]):
-                            # For example)
-                            # If open price is 100 and places an limit buy order 110
-                            # The order should be executed at 100 not 110
-                            if ((order.qty > 0 and order.price > open) or
-                                (order.qty < 0 and order.price < open)):
-                                self._execute_trade(symbol, order, open)
-                                continue
-                        
-                        self._execute_trade(symbol, order)
-                else:
-                    # STOP LIMIT, STOP MARKET Trigger Condition:
-                    # LONG: Current Price >= Stop Price
-                    # SHORT: Current Price <= Stop Price
-                    if order.is_triggered == False:
-                        # Check for the STOP order Trigger Condition
-                        if ((order.qty > 0 and high >= order.stop_price) or 
-                            (order.qty < 0 and low <= order.stop_price)):
-                            order.is_triggered = True # Trigger the Order
-
-                if order.is_triggered == True:
-                    if order.price is None: # STOP MARKET ORDER
-                        self._execute_trade(symbol, order, order.stop_price)
-                    else: # STOP LIMIT ORDER
-                        if ((order.qty > 0 and low < order.price) or 
-                            (order.qty < 0 and high > order.price)):
-                            # If the order just has been created
-                            if order.created_at == pd.to_datetime(self.data.index[self._i]):
-                                # For example)
-                                # If open price is 100 and places an limit buy order 110
-                                # The order should be executed at 100 not 110
-                                if ((order.qty > 0 and order.price > open) or
-                                    (order.qty < 0 and order.price < open)):
-                                    self._execute_trade(symbol, order, open)
-                                    continue
-                            
-                            self._execute_trade(symbol, order)
-                    
-        self._i += 1
\ No newline at end of file
+            # Sequence ambiguous bars on the attached lower-timeframe path
+            path = self._intrabar.get(symbol)
+            if path is not None and path[2][self._i] < path[3][self._i] and book.ambiguous(high, low):
+                fine_high, fine_low, start, end = path
+                for j in range(start[self._i], end[self._i]):
+                    for order in book.crossed(fine_high[j], fine_low[j]):
+                        self._fill(symbol, order, open)
+            else:
+                for order in book.crossed(high, low):
+                    self._fill(symbol, order, open)
+
+            # Trailing stops follow this bar's extreme from the next bar on
+            trailing = self._trailing.get(symbol)
+            if trailing:
+                self._trail(symbol, trailing, high, low)
+
+        # Expire orders whose last live bar was this one
+        while self._expiries and self._expiries[0][0] <= self._i + 1:
+            _, _, order = heapq.heappop(self._expiries)
+            if order.id in self.open_orders.get(order.symbol, ()):
+                self._expire(order)
+
+        self._mark_to_market()
+        self._i += 1
+
+    def _fill(self, symbol: str, order: Order, open: float):
+        # An OCO sibling filled earlier in this bar may have cancelled it
+        if order.id not in self.open_orders[symbol]:
+            return
+        if order.type == OrderType.MARKET:
+            # Execute the trade with price being
+            # open price because its market order
+            self._execute_trade(symbol, order, open)
+        elif order.price is None: # STOP MARKET ORDER
+            self._execute_trade(symbol, order, order.stop_price)
+        # LIMIT and triggered STOP LIMIT orders:
+        # If the order just has been created
+        # For example)
+        # If open price is 100 and places an limit buy order 110
+        # The order should be executed at 100 not 110
+        elif (order.created_i == self._i and
+              ((order.qty > 0 and order.price > open) or
+               (order.qty < 0 and order.price < open))):
+            self._execute_trade(symbol, order, open)
+        else:
+            self._execute_trade(symbol, order)
+
+    def _liquidations(self) -> np.ndarray:
+        """
+        Slots whose position the previous bar's range crossed the liquidation
+        price of, in position-creation order. Flat positions are masked out
+        before any price is read.
+        LONG: prev low <= LP, SHORT: prev high >= LP
+        """
+        n = len(self._slots)
+        qty = self._qty[:n]
+        active = np.flatnonzero(qty)
+        if not len(active):
+            return active
+
+        i = self._i - 1
+        if self._panel is not None:
+            rows = self._rows[active]
+            high, low = self._panel.high[rows, i], self._panel.low[rows, i]
+        else:
+            bars = [self._bars(self._symbols[k], i) for k in active]
+            high = np.array([b[1] for b in bars])
+            low = np.array([b[2] for b in bars])
+
+        q, lp = qty[active], self._liq[active]
+        hit = ((q > 0) & (low <= lp)) | ((q < 0) & (high >= lp))
+        return active[hit]
+
+    def _mark_to_market(self):
+        """
+        Marks every position at the current bar's close:
+            equity      = cash + sum(qty * (close - entry))
+            margin_used = sum(position margin)
+            exposure    = sum(|qty| * close)
+        Only open positions are read, so the cost scales with them, not with
+        every slot ever created. Symbols without a price this bar (NaN
+        close) keep their last mark.
+        """
+        n = len(self._slots)
+        active = np.flatnonzero(self._qty[:n])
+        if not len(active):
+            self.equity, self.margin_used, self.exposure = self.cash, 0.0, 0.0
+            return
+
+        if self._panel is not None:
+            close = self._panel.close[self._rows[active], self._i]
+        else:
+            close = np.array([self._close(self._symbols[k], self._i) for k in active])
+
+        valid = ~np.isnan(close)
+        self._mark[active[valid]] = close[valid]
+        qty, mark = self._qty[active], self._mark[active]
+
+        self.equity = self.cash + float(qty @ (mark - self._entry[active]))
+        self.margin_used = float(self._margin[:n].sum())
+        self.exposure = float(np.abs(qty) @ mark)
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import pandas as pd
+from typing import Dict, Optional, Union
+from overfitting.data import Data
+from overfitting.store import META_FILE, FORMAT_VERSION
+
+# Parsed Data is cached as a columnar store (see overfitting.store) per source
+# file + parse options, so repeated loads are a memory-mapped open instead of
+# pd.read_csv + timestamp parsing.
+DEFAULT_CACHE_DIR = os.environ.get(
+    "OVERFITTING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "overfitting"))
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3  # 10 GB
+
+
+def cache_key(path: str, options: dict) -> str:
+    """Hash of source path, size, mtime and parse options."""
+    st = os.stat(path)
+    source = {
+        "path": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "options": options,
+        "version": FORMAT_VERSION,
+    }
+    blob = json.dumps(source, sort_keys=True, default=repr).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def load_csv(path: str,
+             *,
+             cache_dir: Optional[str] = None,
+             max_bytes: int = DEFAULT_MAX_BYTES,
+             dtype: str = "native",
+             downcast: Union[str, Dict[str, str], None] = None,
+             mmap: bool = True,
+             **read_csv_kwargs) -> Data:
+    """
+    pd.read_csv + Data(df) with a binary cache in front of it.
+
+    The first load parses the CSV and writes the normalized arrays to
+    `cache_dir`; later loads of the same (unchanged) file with the same
+    options open the cached store with np.memmap. The cache is evicted
+    least-recently-used first once it grows past `max_bytes`.
+
+    Usage: data = load_csv("./data/BTCUSDT.csv").slice("2023-01-01", None)
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    options = {"dtype": dtype, "downcast": downcast, "read_csv": read_csv_kwargs}
+    entry = os.path.join(cache_dir, cache_key(path, options))
+
+    if os.path.exists(os.path.join(entry, META_FILE)):
+        _touch(entry)
+        return Data.load(entry, mmap=mmap)
+
+    d = Data(pd.read_csv(path, **read_csv_kwargs), dtype=dtype, downcast=downcast)
+
+    # Write next to the entry and rename, so concurrent workers never read a partial store
+    tmp = f"{entry}.tmp-{os.getpid()}"
+    d.save(tmp)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another worker published the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    _touch(entry)
+    evict(cache_dir, max_bytes, keep=entry)
+    return Data.load(entry, mmap=mmap)
+
+
+def _touch(entry: str):
+    now = time.time()
+    os.utime(os.path.join(entry, META_FILE), (now, now))
+
+
+def _entries(cache_dir: str):
+    """(last_used, bytes, path) of every complete cache entry."""
+    out = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        meta = os.path.join(entry, META_FILE)
+        if not os.path.exists(meta):
+            continue
+        size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        out.append((os.path.getmtime(meta), size, entry))
+    return out
+
+
+def evict(cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES, keep: Optional[str] = None):
+    """Removes least recently used entries until the cache fits in max_bytes."""
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = sorted(_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in entries:
+        if total <= max_bytes:
+            break
+        if entry == keep:
+            continue
+        # Open memmaps keep working on POSIX after their files are unlinked
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def clear_cache(cache_dir: Optional[str] = None):
+    evict(cache_dir, max_bytes=0)
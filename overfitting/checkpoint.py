@@ -0,0 +1,43 @@
+import pickle
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+class Checkpoint:
+    """
+    Broker state between two bars: the pickled run state (trade log
+    included), an optional user (strategy) state and the recorded account
+    of the bars before it. It restores into any Strategy / Broker over data
+    with the same symbols and the same bars up to `i`, so scenarios can
+    continue over different bars after it.
+
+    :param int i: index of the next bar to simulate
+    :param bytes state: pickled broker attributes (see Broker.checkpoint)
+    :param tuple symbols: sorted MultiCurrency symbols (None for single currency data)
+    :param tuple stamps: int64 ns times of the first and last simulated bar (None at bar 0)
+    :param user: strategy state from Strategy.get_state()
+    :param np.ndarray curve: per-bar account of bars [0, i) (see Strategy.run)
+    """
+    __slots__ = ("i", "state", "symbols", "stamps", "user", "curve")
+
+    def __init__(self,
+                 i: int,
+                 state: bytes,
+                 symbols: Optional[Tuple[str, ...]],
+                 stamps: Optional[Tuple[int, int]],
+                 user: Any = None,
+                 curve: Optional[np.ndarray] = None):
+        self.i = i
+        self.state = state
+        self.symbols = symbols
+        self.stamps = stamps
+        self.user = user
+        self.curve = curve
+
+    def __repr__(self):
+        return (f"Checkpoint("
+                f"i={self.i}, "
+                f"symbols={None if self.symbols is None else len(self.symbols)}, "
+                f"bytes={len(self.state)})")
+
+    def load(self) -> Dict[str, Any]:
+        return pickle.loads(self.state)
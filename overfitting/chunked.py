@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Tuple
+from overfitting.errors import InitializationError
+from overfitting.store import ColumnStoreWriter, read_meta, open_column
+from overfitting.data import Data, TimeIndexed
+
+class _Window:
+    """Bars [lo, hi) of every column copied into RAM."""
+
+    def __init__(self, lo: int, hi: int, arrays: Dict[str, np.ndarray]):
+        self.lo = lo
+        self.hi = hi
+        self.arrays = arrays
+
+
+class ChunkedColumn:
+    """
+    A column of ChunkedData indexed with global bar indices.
+    Reads hit the resident window; anything outside falls back to the store.
+    """
+
+    def __init__(self, source: "ChunkedData", name: str):
+        self._source = source
+        self.name = name
+        self.dtype = source._mmaps[name].dtype
+
+    def __len__(self):
+        return self._source.n
+
+    def __getitem__(self, i):
+        w = self._source._window
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._source.n)
+            if step == 1 and w.lo <= start and stop <= w.hi:
+                return w.arrays[self.name][start - w.lo:stop - w.lo]
+            return np.asarray(self._source._mmaps[self.name][i])
+
+        if i < 0:
+            i += self._source.n
+        if w.lo <= i < w.hi:
+            return w.arrays[self.name][i - w.lo]
+        return self._source._mmaps[self.name][i]
+
+    def __array__(self, dtype=None, copy=None):
+        # Full column (e.g. for precomputed indicators), paged in by the OS
+        a = np.asarray(self._source._mmaps[self.name])
+        return a if dtype is None else a.astype(dtype)
+
+
+class ChunkedData(TimeIndexed):
+
+    index: np.ndarray         # datetime64[ns] index (memory-mapped)
+    columns: tuple[str, ...]  # Available columns
+    n: int                    # Number of rows
+
+    """
+    Out-of-core Data backed by a columnar store (see Data.save / ChunkedData.from_csv).
+
+    Strategy.run walks the history window by window: each window holds
+    `chunk_size` bars plus `lookback` earlier bars in RAM, and the next window
+    is read on a background thread while the current one is simulated.
+    Columns keep the Data API with global indices: data.close[i], data.close[i-20:i].
+
+    Usage: ChunkedData("./store/btc-1s", chunk_size=1_000_000, lookback=10_000)
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1_000_000, lookback: int = 10_000, prefetch: bool = True):
+        if chunk_size <= 0 or lookback < 0:
+            raise InitializationError("chunk_size must be > 0 and lookback >= 0.")
+
+        meta = read_meta(path)
+        if meta["n"] == 0:
+            raise InitializationError(f"Column store at '{path}' is empty.")
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.lookback = lookback
+        self.n = meta["n"]
+        self._mmaps = {c: open_column(path, meta, c) for c in meta["columns"]}
+        self.index = self._mmaps[meta["index"]]
+        self.columns = tuple(sorted(meta["columns"], key=lambda x: (x != 'timestamp', x)))
+        self._cols = {c: ChunkedColumn(self, c) for c in self.columns}
+        self._executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self._window = self._load(0)
+
+    def __repr__(self):
+        return (f"ChunkedData("
+                f"path={self.path}, "
+                f"n={self.n}, "
+                f"chunk_size={self.chunk_size}, "
+                f"lookback={self.lookback})")
+
+    @classmethod
+    def from_csv(cls, csv_path: str, store_path: str, csv_chunksize: int = 1_000_000, **kwargs) -> "ChunkedData":
+        """
+        Streams a CSV larger than RAM into a columnar store (each chunk is
+        normalized through Data) and opens it as ChunkedData.
+        Extra kwargs go to ChunkedData().
+        """
+        with ColumnStoreWriter(store_path) as w:
+            for df in pd.read_csv(csv_path, chunksize=csv_chunksize):
+                w.append(dict(Data(df).items()))
+
+        return cls(store_path, **kwargs)
+
+    def _load(self, start: int) -> _Window:
+        lo = max(0, start - self.lookback)
+        hi = min(self.n, start + self.chunk_size)
+        return _Window(lo, hi, {c: np.array(m[lo:hi]) for c, m in self._mmaps.items()})
+
+    def windows(self, first: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yields (start, stop) bar ranges from the one holding bar `first`, prefetching the next window."""
+        pending = None
+        for start in range(first - first % self.chunk_size, self.n, self.chunk_size):
+            if pending is not None:
+                self._window = pending.result()
+            elif not (self._window.lo <= start and min(self.n, start + self.chunk_size) <= self._window.hi):
+                self._window = self._load(start)
+
+            nxt = start + self.chunk_size
+            pending = self._executor.submit(self._load, nxt) if self._executor and nxt < self.n else None
+            yield start, min(self.n, nxt)
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        try:
+            return self._cols[key]
+        except KeyError:
+            raise AttributeError(f"'ChunkedData' has no field '{key}'. Available: {', '.join(self.columns)}")
+
+    def __getitem__(self, key) -> ChunkedColumn:
+        return self._cols[key]
+
+    def __contains__(self, key):
+        return key in self._cols
+
+    def get(self, key, default=None):
+        return self._cols.get(key, default)
+
+    def __len__(self):
+        return self.n
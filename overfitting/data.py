@@ -1,11 +1,108 @@
+import os
+import json
 import pandas as pd
 import numpy as np
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
 from pandas.api.types import is_datetime64_any_dtype, is_integer_dtype, is_float_dtype
 from overfitting.errors import InitializationError
+from overfitting.store import write_store, read_meta, open_column
+from overfitting.validation import ValidationReport, validate_ohlc, repair_plan
 
 REQUIRED_OHLC = ("open", "high", "low", "close")
+COMPACT_COLUMNS = REQUIRED_OHLC + ("volume",)
+# float32 keeps 24 significant bits: every compact price is within
+# 2**-24 (~6e-8) relative error of its float64 value. Fill prices that come
+# straight from bars / order prices stay within this tolerance.
+COMPACT_RTOL = 1e-6
 
-class Data(dict):
+def _target_dtype(column: str, values: pd.Series, dtype: str, downcast):
+    """dtype a source column is converted to, None to keep it as is."""
+    src = values.dtype
+    if column == "timestamp":
+        return None
+    if dtype == "compact" and column in COMPACT_COLUMNS:
+        return np.float32
+    if isinstance(downcast, dict):
+        return downcast.get(column)
+    if downcast in ("float32", "auto") and is_float_dtype(src):
+        return np.float32
+    if downcast == "auto" and is_integer_dtype(src):
+        # Smallest integer type holding both extremes
+        return np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max()))
+    return None
+
+def _as_ns(ts) -> np.ndarray:
+    """Timestamps (scalar or array-like) as int64 nanoseconds since epoch."""
+    if np.ndim(ts) == 0:
+        return np.int64(pd.Timestamp(ts).tz_localize(None).value)
+    if isinstance(ts, np.ndarray) and ts.dtype.kind == "M":
+        return ts.astype("datetime64[ns]").view("i8")
+    dt = pd.DatetimeIndex(pd.to_datetime(ts)).tz_localize(None)
+    return dt.values.astype("datetime64[ns]").view("i8")
+
+
+def locate_many(index: np.ndarray, ts, side: str = "left") -> np.ndarray:
+    """
+    Vectorized timestamp -> bar index lookup on a sorted datetime64[ns] index
+    with binary search (O(log n) per timestamp).
+        - 'left':    last bar at or before ts (the bar containing ts)
+        - 'right':   first bar at or after ts
+        - 'nearest': closest bar (earlier bar on ties)
+    Timestamps with no such bar map to -1.
+    """
+    idx = np.asarray(index).view("i8")
+    t = np.atleast_1d(_as_ns(ts))
+    n = len(idx)
+
+    if side == "left":
+        pos = np.searchsorted(idx, t, side="right") - 1
+    elif side == "right":
+        pos = np.searchsorted(idx, t, side="left")
+        pos[pos >= n] = -1
+    elif side == "nearest":
+        right = np.searchsorted(idx, t, side="left")
+        left = np.maximum(right - 1, 0)
+        right = np.minimum(right, n - 1)
+        pos = np.where(np.abs(t - idx[right]) < np.abs(t - idx[left]), right, left)
+    else:
+        raise ValueError(f"side must be 'left', 'right' or 'nearest' - {side}")
+    return pos
+
+
+class TimeIndexed:
+    """Binary search lookups over the datetime64[ns] `index` attribute."""
+
+    def locate(self, ts, side: str = "left") -> int:
+        """
+        Bar index for a timestamp (see locate_many for `side`), -1 if none.
+        Usage: i = data.locate("2024-03-01 08:00", side="left")
+        """
+        return int(locate_many(self.index, ts, side)[0])
+
+    def locate_many(self, ts, side: str = "left") -> np.ndarray:
+        """Vectorized locate() for an array of timestamps (e.g. news or funding times)."""
+        return locate_many(self.index, ts, side)
+
+    def between(self, start=None, end=None) -> Tuple[int, int]:
+        """
+        Bar bounds (a, b) of the half-open time range [start, end):
+        index[a:b] holds every bar with start <= timestamp < end.
+        None leaves that side open.
+        """
+        idx = np.asarray(self.index).view("i8")
+        a = 0 if start is None else int(np.searchsorted(idx, _as_ns(start), side="left"))
+        b = len(idx) if end is None else int(np.searchsorted(idx, _as_ns(end), side="left"))
+        return a, max(a, b)
+
+    def _bounds(self, start, end) -> Tuple[int, int]:
+        # Integers are bar positions, anything else is a timestamp
+        if all(x is None or isinstance(x, (int, np.integer)) for x in (start, end)):
+            a, b, _ = slice(start, end).indices(len(self.index))
+            return a, max(a, b)
+        return self.between(start, end)
+
+
+class Data(TimeIndexed, dict):
     
     open: np.ndarray          # [Required] Open prices 
     high: np.ndarray          # [Required] High prices
@@ -15,15 +112,45 @@ class Data(dict):
     index: np.ndarray         # Fast datetime64[ns] index
     columns: tuple[str, ...]  # Available columns
     n: int                    # Number of rows
+    validation: ValidationReport  # Load-time report (validate=...) or None
 
     """
     Usage: data.open[i], data.high[i], data.timestamp[i]
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self,
+                 df: pd.DataFrame,
+                 dtype: str = "native",
+                 downcast: Union[str, Dict[str, str], None] = None,
+                 validate: Optional[str] = None):
+        """
+        :param pd.DataFrame df: OHLC frame with a 'timestamp' column or DatetimeIndex
+        :param str dtype: 'native' keeps the pandas dtypes,
+            'compact' stores open/high/low/close/volume as float32
+        :param downcast: extra (non OHLCV) columns to downcast
+            - 'float32': every float column -> float32
+            - 'auto': floats -> float32, integers -> smallest integer type that fits
+            - dict: {column: dtype}
+        :param str validate: vectorized OHLC / timestamp checks at load time
+            - None: skip (default)
+            - 'report': only attach the report as `data.validation`
+            - 'raise': raise InitializationError on any broken invariant
+            - 'drop': drop bad bars and duplicate / out-of-order timestamps
+            - 'ffill': bad bars copy the last valid bar, bad timestamps are dropped
+        The timestamp column and index always share one int64 nanosecond buffer.
+        """
         if not isinstance(df, pd.DataFrame) or df.empty:
             raise InitializationError("Data must be a non-empty pandas DataFrame.")
 
+        if dtype not in ("native", "compact"):
+            raise InitializationError(f"dtype must be 'native' or 'compact' - {dtype}")
+
+        if not isinstance(downcast, dict) and downcast not in (None, "float32", "auto"):
+            raise InitializationError(f"downcast must be 'float32', 'auto' or a dict - {downcast}")
+
+        if validate not in (None, "report", "raise", "drop", "ffill"):
+            raise InitializationError(f"validate must be 'report', 'raise', 'drop' or 'ffill' - {validate}")
+
         # Validate OHLC
         missing = [c for c in REQUIRED_OHLC if c not in df.columns]
         if missing:
@@ -39,38 +166,242 @@ class Data(dict):
             raise InitializationError("Provide a 'timestamp' column or use a DatetimeIndex.")
 
         # Coerce timestamp to datetime64[ns]
-        ts = self._to_datetime_ns(ts)
+        index = self._to_datetime_ns(ts).to_numpy()
+
+        def load_column(c: str) -> np.ndarray:
+            target = _target_dtype(c, df[c], dtype, downcast)
+            return df[c].to_numpy() if target is None else df[c].to_numpy(dtype=target)
+
+        def column_dtype(c: str) -> np.dtype:
+            # What load_column(c) will produce, without converting anything
+            target = _target_dtype(c, df[c], dtype, downcast)
+            if target is not None:
+                return np.dtype(target)
+            return df[c].dtype if isinstance(df[c].dtype, np.dtype) else np.dtype(object)
+
+        # Single buffer shared by the timestamp column and the index
+        payload = {"timestamp": index}
+        report = None
+
+        if validate is not None:
+            ohlc = {c: load_column(c) for c in REQUIRED_OHLC}
+            report = validate_ohlc(index, *ohlc.values())
+
+            if validate == "raise" and not report.ok:
+                raise InitializationError(f"Invalid OHLC data - {report}")
+
+            keep, source = repair_plan(report, index, validate) if validate in ("drop", "ffill") else (None, None)
+            if source is not None:
+                ohlc = {c: v[source] for c, v in ohlc.items()}
+            elif keep is not None:
+                ohlc = {c: v[keep] for c, v in ohlc.items()}
+
+            if keep is not None:
+                index = index[keep]
+                payload = {"timestamp": index}
+                raw_column = load_column
+                load_column = lambda c: raw_column(c)[keep]
+            payload.update(ohlc)
+
+        # Other columns are converted on first access; the frame is untouched until then
+        self._init_arrays(payload, index, lazy=list(df.columns), loader=load_column, dtype_of=column_dtype)
+        object.__setattr__(self, "validation", report)
+
+    def _init_arrays(self,
+                     payload: Dict[str, np.ndarray],
+                     index: np.ndarray,
+                     lazy: Sequence[str] = (),
+                     loader: Optional[Callable[[str], np.ndarray]] = None,
+                     dtype_of: Optional[Callable[[str], np.dtype]] = None):
+        dict.__init__(self, payload)
+        pending = {c for c in lazy if c not in payload}
+        columns = list(lazy) + [c for c in payload if c not in lazy]
+        object.__setattr__(self, "columns", tuple(["timestamp"] + [c for c in columns if c != "timestamp"]))
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "n", len(index))
+        object.__setattr__(self, "_pending", pending)
+        object.__setattr__(self, "_loader", loader if pending else None)
+        object.__setattr__(self, "_dtype_of", dtype_of if pending else None)  # dtype of a lazy column before loading
+        object.__setattr__(self, "validation", None)
+        object.__setattr__(self, "_timeframes", {})
+
+    def validate(self) -> ValidationReport:
+        """Runs the OHLC / timestamp checks on this Data (no repair)."""
+        return validate_ohlc(self.index, self.open, self.high, self.low, self.close)
+
+    @classmethod
+    def _from_arrays(cls,
+                     payload: Dict[str, np.ndarray],
+                     index: np.ndarray,
+                     lazy: Sequence[str] = (),
+                     loader: Optional[Callable[[str], np.ndarray]] = None,
+                     dtype_of: Optional[Callable[[str], np.dtype]] = None) -> "Data":
+        """Wraps already normalized arrays (and lazily loaded columns) without copying them."""
+        obj = cls.__new__(cls)
+        obj._init_arrays(payload, index, lazy, loader, dtype_of)
+        return obj
+
+    def slice(self, start=None, end=None) -> "Data":
+        """
+        Zero-copy view of bars [start, end) for walk-forward / cross-validation folds.
+        start / end are bar positions (int) or timestamps; every column of the
+        result is a view into this Data's buffers.
+        Usage: fold = data.slice("2023-01-01", "2023-07-01")
+        """
+        a, b = self._bounds(start, end)
+        index = self.index[a:b]
+        view = Data._from_arrays({"timestamp": index}, index, lazy=self.columns,
+                                 loader=lambda c: self[c][a:b], dtype_of=self._column_dtype)
+        # Higher timeframe maps are sliced with the bars
+        for name, tf in self._timeframes.items():
+            view._timeframes[name] = Timeframe(name, tf.bars, tf.map[a:b])
+        return view
+
+    def attach_timeframe(self, name: str, bars: Union[pd.DataFrame, "Data", None] = None) -> "Timeframe":
+        """
+        Attaches a higher timeframe (e.g. '1h', '4h', '1d') and precomputes,
+        for every base bar i, the last higher timeframe bar completed before
+        bar i opens (no lookahead).
+        :param str name: timeframe duration, parsed with pd.Timedelta
+        :param bars: higher timeframe bars; resampled from this Data when None
+        Usage: data.attach_timeframe("1h"); data.htf("1h").close[i]
+        """
+        try:
+            duration = pd.Timedelta(name).value
+        except ValueError:
+            raise InitializationError(f"Invalid timeframe '{name}'. Use a duration such as '1h', '4h' or '1d'.")
+
+        if bars is None:
+            bars = _resample(self, duration)
+        elif not isinstance(bars, Data):
+            bars = Data(bars)
 
-        payload = {c: df[c].to_numpy() for c in df.columns}
-        payload["timestamp"] = ts.to_numpy()
+        # A higher timeframe bar is complete once its end time has passed
+        ends = np.asarray(bars.index).view("i8") + duration
+        m = np.searchsorted(ends, np.asarray(self.index).view("i8"), side="right") - 1
 
-        super().__init__(payload)
-        object.__setattr__(self, "columns", tuple(sorted(payload.keys(), key=lambda x: (x!='timestamp', x))))
-        object.__setattr__(self, "index", ts.to_numpy())
-        object.__setattr__(self, "n", len(df))
+        tf = Timeframe(name, bars, m)
+        self._timeframes[name] = tf
+        return tf
+
+    def htf(self, name: str) -> "Timeframe":
+        try:
+            return self._timeframes[name]
+        except KeyError:
+            raise AttributeError(f"Timeframe '{name}' is not attached. Call attach_timeframe('{name}') first.")
+
+    def __missing__(self, key):
+        # First access of a lazy column: materialize and keep it
+        if key not in self._pending:
+            raise KeyError(key)
+
+        values = self._loader(key)
+        dict.__setitem__(self, key, values)
+        self._pending.discard(key)
+        if not self._pending:
+            object.__setattr__(self, "_loader", None)  # release the source
+            object.__setattr__(self, "_dtype_of", None)
+        return values
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._pending
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def keys(self):
+        return self.columns
+
+    def values(self):
+        return [self[c] for c in self.columns]
+
+    def items(self):
+        return [(c, self[c]) for c in self.columns]
+
+    @property
+    def materialized(self) -> tuple:
+        """Columns converted so far."""
+        return tuple(c for c in self.columns if dict.__contains__(self, c))
+
+    def save(self, path: str):
+        """
+        Writes every column to a columnar store at `path`
+        (one raw file per column + meta.json). Re-open with Data.load(path).
+        """
+        write_store(path, dict(self.items()), index="timestamp")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "Data":
+        """
+        Opens a store written by Data.save(). With mmap=True the columns are
+        read-only np.memmap views, so many backtests opening the same store
+        share the page cache instead of each holding a private copy.
+        """
+        meta = read_meta(path)
+        index = open_column(path, meta, meta["index"], mmap)
+        if index.dtype.kind != "M":
+            raise InitializationError(f"Store index '{meta['index']}' is not datetime64 - {index.dtype}")
+
+        # Other columns are mapped on first access
+        return cls._from_arrays({meta["index"]: index}, index, lazy=list(meta["columns"]),
+                                loader=lambda c: open_column(path, meta, c, mmap),
+                                dtype_of=lambda c: np.dtype(meta["columns"][c]))
 
     @staticmethod
     def _to_datetime_ns(s: pd.Series) -> pd.Series:
         if is_datetime64_any_dtype(s):
-            dt = pd.to_datetime(s) 
-            # drop tz if present
-            try:
-                dt = dt.tz_localize(None)
-            except Exception:
-                pass
-            return dt
-
-        if is_integer_dtype(s) or is_float_dtype(s):
+            dt = pd.to_datetime(s)
+        elif is_integer_dtype(s) or is_float_dtype(s):
             # Heuristic: ms since epoch vs seconds
             mx = pd.Series(s).max()
             unit = "ms" if mx > 1e12 else "s"
-            return pd.to_datetime(s, unit=unit)
+            dt = pd.to_datetime(s, unit=unit)
+        else:
+            # Strings or mixed -> let pandas parse
+            dt = pd.to_datetime(s, errors="raise")
+
+        # Drop tz from the values, keeping wall-clock time (as _as_ns does)
+        if getattr(dt.dtype, "tz", None) is not None:
+            dt = dt.dt.tz_localize(None)
+        return dt.astype("datetime64[ns]")
+
+    def _column_dtype(self, c: str) -> Optional[np.dtype]:
+        # dtype a column has, or will have once loaded (None when unknown)
+        if c not in self._pending:
+            return self[c].dtype
+        return None if self._dtype_of is None else self._dtype_of(c)
 
-        # Strings or mixed -> let pandas parse
-        return pd.to_datetime(s, errors="raise")
+    def memory_usage(self) -> pd.DataFrame:
+        """
+        Bytes held per column next to what the same column costs in its
+        native (float64 / int64) form. Buffers shared with the index are
+        counted once. Columns not accessed yet (loaded=False) are reported
+        at the size they will have, without loading them.
+        """
+        rows = {}
+        for c in self.columns:
+            loaded = c not in self._pending
+            dtype = self._column_dtype(c)
+            if dtype is None:
+                rows[c] = ("unknown", 0, 0, loaded)
+                continue
+
+            shared = loaded and c == "timestamp" and np.shares_memory(self[c], self.index)
+            native = 8 if dtype.kind in "iuf" else dtype.itemsize
+            rows[c] = (str(dtype), 0 if shared else dtype.itemsize * self.n, 0 if shared else native * self.n, loaded)
+
+        rows["index"] = (str(self.index.dtype), self.index.nbytes, self.index.nbytes, True)
+        report = pd.DataFrame.from_dict(rows, orient="index", columns=["dtype", "bytes", "native_bytes", "loaded"])
+        report["saved"] = report["native_bytes"] - report["bytes"]
+        return report
 
     def __getattr__(self, key):
         # attribute-style access for columns
+        if key.startswith("_"):
+            raise AttributeError(key)
         try:
             return self[key]
         except KeyError:
@@ -86,35 +417,352 @@ class Data(dict):
         else:
             raise AttributeError("Data is read-only; modify the source DataFrame before wrapping.")
         
-class MultiCurrency(dict):
+class Timeframe:
+
+    name: str          # Timeframe label, e.g. '1h'
+    bars: Data         # Higher timeframe bars
+    map: np.ndarray    # base bar i -> last completed higher timeframe bar (-1 if none)
+
+    """
+    Higher timeframe columns aligned to the base bar grid without lookahead.
+    Usage: data.htf("1h").close[i] - close of the last 1h bar completed before bar i
+    """
+
+    def __init__(self, name: str, bars: Data, map: np.ndarray):
+        self.name = name
+        self.bars = bars
+        self.map = map
+        self._aligned: Dict[str, np.ndarray] = {}
+
+    def __repr__(self):
+        return (f"Timeframe("
+                f"name={self.name}, "
+                f"bars={self.bars.n}, "
+                f"n={len(self.map)})")
+
+    def __getattr__(self, key) -> np.ndarray:
+        if key.startswith("_"):
+            raise AttributeError(key)
+
+        # Gathered once per column, then every lookup is a single array index
+        if key not in self._aligned:
+            try:
+                values = self.bars[key]
+            except KeyError:
+                raise AttributeError(f"'Timeframe' has no field '{key}'. Available: {', '.join(self.bars.columns)}")
+
+            ready = self.map >= 0
+            aligned = values.take(np.where(ready, self.map, 0))
+            if not ready.all():
+                aligned = _fill_missing(aligned, ~ready)
+            self._aligned[key] = aligned
+        return self._aligned[key]
+
+
+def _resample(d: Data, duration: int) -> Data:
+    """Vectorized OHLCV resampling into epoch aligned buckets of `duration` ns."""
+    t = np.asarray(d.index).view("i8")
+    bucket = t - t % duration
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(t)] - 1
+
+    index = bucket[starts].view("datetime64[ns]")
+    payload = {
+        "timestamp": index,
+        "open": d.open[starts],
+        "high": np.fmax.reduceat(d.high, starts),
+        "low": np.fmin.reduceat(d.low, starts),
+        "close": d.close[ends],
+    }
+    if "volume" in d:
+        payload["volume"] = np.add.reduceat(d.volume, starts)
+
+    return Data._from_arrays(payload, index)
+
+
+class Panel:
+
+    values: np.ndarray            # (symbol, field, time) contiguous float array
+    symbols: tuple[str, ...]      # Symbol axis labels
+    fields: tuple[str, ...]       # Field axis labels
+    symbol_index: dict[str, int]  # symbol -> position on axis 0
+    field_index: dict[str, int]   # field -> position on axis 1
+    tradable: np.ndarray          # (symbol, time) bool mask or None
+
+    """
+    Usage: data.panel.close[:, i], data.panel.close[sym_idx, a:b]
+    """
+
+    def __init__(self, values: np.ndarray, symbols, fields, tradable: np.ndarray = None):
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "symbols", tuple(symbols))
+        object.__setattr__(self, "fields", tuple(fields))
+        object.__setattr__(self, "symbol_index", {s: k for k, s in enumerate(symbols)})
+        object.__setattr__(self, "field_index", {f: k for k, f in enumerate(fields)})
+        object.__setattr__(self, "tradable", tradable)
+
+    def __getattr__(self, field) -> np.ndarray:
+        # (symbol, time) view of one field
+        try:
+            return self.values[:, self.field_index[field], :]
+        except KeyError:
+            raise AttributeError(f"'Panel' has no field '{field}'. Available: {', '.join(self.fields)}")
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Panel is read-only; modify the source DataFrame before wrapping.")
+
+    def __repr__(self):
+        return (f"Panel("
+                f"symbols={len(self.symbols)}, "
+                f"fields={self.fields}, "
+                f"n={self.values.shape[2]})")
+
+    @classmethod
+    def _build(cls, payload: Dict[str, Data]) -> "Panel":
+        symbols = list(payload)
+        datas = list(payload.values())
+
+        # Numeric columns shared by every symbol become panel fields
+        skip = ("timestamp", "tradable")
+        fields = [c for c in datas[0].columns
+                  if c not in skip and all(c in d.columns and d[c].dtype.kind in "biuf" for d in datas)]
+
+        # float32 when every field is compact, float64 otherwise
+        dtype = np.result_type(np.float32, *[d[c].dtype for d in datas for c in fields])
+        values = np.empty((len(symbols), len(fields), datas[0].n), dtype=dtype)
+        for k, d in enumerate(datas):
+            for f, c in enumerate(fields):
+                values[k, f] = d[c]
+
+        tradable = None
+        if any("tradable" in d.columns for d in datas):
+            tradable = np.ones((len(symbols), datas[0].n), dtype=bool)
+            for k, d in enumerate(datas):
+                if "tradable" in d.columns:
+                    tradable[k] = d.tradable
+
+        return cls(values, symbols, fields, tradable)
+
+    def _views(self, symbol: str, d: Data) -> Data:
+        """Re-wraps a symbol's Data so its panel fields are views into values."""
+        k = self.symbol_index[symbol]
+        payload = {"timestamp": d.index}
+        for f, c in enumerate(self.fields):
+            payload[c] = self.values[k, f]
+        if self.tradable is not None:
+            payload["tradable"] = self.tradable[k]
+
+        # Non-panel columns stay lazy in the source Data
+        return Data._from_arrays(payload, d.index, lazy=d.columns, loader=d.__getitem__, dtype_of=d._column_dtype)
+
+
+class MultiCurrency(TimeIndexed, dict):
 
     symbols: tuple[str, ...]  # List of symbols in this container
     index: np.ndarray         # datetime64[ns] index
     n: int                    # Number of rows per symbol
+    panel: Panel              # Contiguous (symbol, field, time) store or None
 
-    def __init__(self, frames: dict[str, pd.DataFrame]):
+    def __init__(self,
+                 frames: Dict[str, Union[pd.DataFrame, Data]],
+                 align: str = "strict",
+                 panel: bool = False,
+                 dtype: str = "native",
+                 downcast: Union[str, Dict[str, str], None] = None,
+                 validate: Optional[str] = None):
+        """
+        :param dict frames: symbol -> DataFrame (or prebuilt Data)
+        :param str align: how to handle symbols whose timestamps differ
+            - 'strict': raise InitializationError (default)
+            - 'ffill': align to the union index, forward-filling synthetic bars
+                       (flat bars at the last close, volume 0)
+            - 'mask':  align to the union index, synthetic bars are NaN
+            Aligned symbols get a boolean 'tradable' column which is False on
+            synthetic bars, so the broker never fills on them.
+        :param bool panel: copy shared numeric columns into one contiguous
+            (symbol, field, time) array exposed as `self.panel`. Per-symbol
+            columns (data[symbol].close) then become zero-copy views into it.
+        :param str dtype, downcast, validate: forwarded to Data() for DataFrame inputs
+        """
         if not isinstance(frames, dict) or not frames:
             raise InitializationError("Data must be non-empty dict Type - dict[str, pd.DataFrame]")
 
-        payload = {}
-        first_ts = None
-        for symbol, df in frames.items():
-            d = Data(df)
-            if first_ts is None:
-                first_ts = d.index
-            else:
-                # Requires identical timestamps for NOW
-                # TODO IMNPLEMENT AUTO FILL for uniform timestamps
-                if len(d.index) != len(first_ts) or not np.array_equal(d.index, first_ts):
-                    raise InitializationError(
-                        f"Len Timestamps for {symbol} are not equal with the other symbols.")
-                
-            payload[symbol] = d
-
-        super().__init__(payload)
+        if align not in ("strict", "ffill", "mask"):
+            raise InitializationError(f"align must be 'strict', 'ffill' or 'mask' - {align}")
+
+        payload = {symbol: df if isinstance(df, Data) else Data(df, dtype=dtype, downcast=downcast, validate=validate)
+                   for symbol, df in frames.items()}
+        first_ts = next(iter(payload.values())).index
+        uniform = all(
+            len(d.index) == len(first_ts) and np.array_equal(d.index, first_ts)
+            for d in payload.values())
+
+        if not uniform:
+            if align == "strict":
+                mismatched = [s for s, d in payload.items()
+                              if len(d.index) != len(first_ts) or not np.array_equal(d.index, first_ts)]
+                raise InitializationError(
+                    f"Timestamps for {mismatched} are not equal with the other symbols. "
+                    f"Use align='ffill' or align='mask' to align them on a union index.")
+
+            first_ts = _union_index([d.index for d in payload.values()])
+            payload = {s: _align(d, first_ts, ffill=(align == "ffill")) for s, d in payload.items()}
+
+        p = None
+        if panel:
+            p = Panel._build(payload)
+            payload = {s: p._views(s, d) for s, d in payload.items()}
+
+        self._init_datas(payload, first_ts, p)
+
+    def _init_datas(self, payload: Dict[str, Data], index: np.ndarray, panel: Optional[Panel]):
+        dict.__init__(self, payload)
         object.__setattr__(self, "symbols", tuple(payload.keys()))
-        object.__setattr__(self, "index", first_ts)
-        object.__setattr__(self, "n", len(first_ts))
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "n", len(index))
+        object.__setattr__(self, "panel", panel)
+
+    def attach_timeframe(self, name: str, frames: Optional[Dict[str, Union[pd.DataFrame, Data]]] = None):
+        """
+        Attaches a higher timeframe to every symbol (see Data.attach_timeframe).
+        :param dict frames: symbol -> higher timeframe bars; resampled when None
+        """
+        for s, d in self.items():
+            d.attach_timeframe(name, None if frames is None else frames[s])
+
+    def slice(self, start=None, end=None) -> "MultiCurrency":
+        """
+        Zero-copy view of bars [start, end) of every symbol (and of the panel).
+        start / end are bar positions (int) or timestamps.
+        """
+        a, b = self._bounds(start, end)
+        p = None
+        if self.panel is not None:
+            tradable = None if self.panel.tradable is None else self.panel.tradable[:, a:b]
+            p = Panel(self.panel.values[:, :, a:b], self.panel.symbols, self.panel.fields, tradable)
+
+        obj = MultiCurrency.__new__(MultiCurrency)
+        obj._init_datas({s: d.slice(a, b) for s, d in self.items()}, self.index[a:b], p)
+        return obj
+
+    def __len__(self) -> int:
+        return self.n
+
+    def save(self, path: str):
+        """
+        Writes one columnar store per symbol under `path`.
+        Re-open with MultiCurrency.load(path).
+        """
+        os.makedirs(path, exist_ok=True)
+        for k, symbol in enumerate(self.symbols):
+            self[symbol].save(os.path.join(path, str(k)))
+
+        with open(os.path.join(path, "symbols.json"), "w") as f:
+            json.dump(list(self.symbols), f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, panel: bool = False) -> "MultiCurrency":
+        symbols_path = os.path.join(path, "symbols.json")
+        if not os.path.exists(symbols_path):
+            raise InitializationError(f"No MultiCurrency store found at '{path}'.")
+
+        with open(symbols_path) as f:
+            symbols = json.load(f)
+
+        return cls({s: Data.load(os.path.join(path, str(k)), mmap=mmap) for k, s in enumerate(symbols)}, panel=panel)
+
+
+def _union_index(indices) -> np.ndarray:
+    """Sorted unique union of several sorted datetime64[ns] indexes."""
+    # Identical indexes (common for symbols on the same grid) are merged once
+    distinct = []
+    for idx in indices:
+        if not any(len(idx) == len(u) and np.array_equal(idx, u) for u in distinct):
+            distinct.append(idx)
+
+    merged = np.concatenate([np.asarray(u, dtype="datetime64[ns]") for u in distinct])
+    # Stable sort (timsort) merges the already sorted runs in O(n log k)
+    merged.sort(kind="stable")
+    keep = np.empty(len(merged), dtype=bool)
+    keep[0] = True
+    np.not_equal(merged[1:], merged[:-1], out=keep[1:])
+    return merged[keep]
+
+
+def _align(d: Data, master: np.ndarray, ffill: bool) -> Data:
+    """
+    Re-indexes one symbol onto `master` with vectorized searchsorted / take
+    per column (no pandas reindexing).
+    """
+    n = len(d.index)
+    tradable = np.zeros(len(master), dtype=bool)
+    a = int(np.searchsorted(master, d.index[0]))
+
+    if a + n <= len(master) and np.array_equal(master[a:a + n], d.index):
+        # Contiguous run (later listing / earlier delisting): no per-bar search
+        tradable[a:a + n] = True
+        pos = np.arange(-a, len(master) - a)
+        np.minimum(pos, n - 1, out=pos)
+
+        def gather(col):
+            out = np.empty(len(master), dtype=col.dtype)
+            out[:a] = col[0]
+            out[a:a + n] = col
+            out[a + n:] = col[-1]
+            return out
+    else:
+        # d.index is a subset of master: mark its bars, then a running count
+        # gives the last real bar at or before every master timestamp
+        tradable[np.searchsorted(master, d.index)] = True
+        pos = np.cumsum(tradable) - 1
+
+        def gather(col):
+            return col.take(pos)  # pos is clamped to >= 0 below
+
+    listed = pos >= 0
+    pos[~listed] = 0
+
+    missing = ~listed if ffill else ~tradable
+    synthetic = listed & ~tradable
+    fill_flat = ffill and synthetic.any()
+
+    payload = {}
+    for c in d.columns:
+        if c in ("timestamp", "tradable"):
+            continue
+
+        values = _fill_missing(gather(d[c]), missing)
+
+        if fill_flat:
+            # Synthetic bars are flat at the previous close with no volume
+            if c in ("open", "high", "low"):
+                values[synthetic] = d.close.take(pos[synthetic])
+            elif c == "volume":
+                values[synthetic] = 0
+
+        payload[c] = values
+
+    if "tradable" in d.columns:
+        tradable &= gather(d.tradable)
+
+    payload["timestamp"] = master
+    payload["tradable"] = tradable
+    return Data._from_arrays(payload, master)
+
+
+def _fill_missing(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    if not missing.any():
+        return values
+
+    if values.dtype.kind in "iub":
+        values = values.astype(np.float64)
+    elif values.dtype.kind not in "fcMm":
+        values = values.astype(object)
 
-        def __len__(self) -> int:
-            return self.n
\ No newline at end of file
+    if values.dtype.kind in "Mm":
+        values[missing] = np.array("NaT", dtype=values.dtype)
+    elif values.dtype == object:
+        values[missing] = None
+    else:
+        values[missing] = np.nan
+    return values
@@ -24,4 +24,7 @@ class LiquidationError(CustomError):
     pass
 
 class StopOrderRejected(CustomError):
+    pass
+
+class CheckpointError(CustomError):
     pass
\ No newline at end of file
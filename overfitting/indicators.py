@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
 from overfitting import Strategy
@@ -19,7 +20,8 @@ class Indicator(ABC):
         if values is None:
             raise AttributeError(f"Column '{name}' not found for symbol '{self.symbol}'")
         
-        return pd.Series(values)
+        # np.asarray also materializes out-of-core (ChunkedData) columns
+        return pd.Series(np.asarray(values))
 
     @abstractmethod
     def compute(self):
@@ -1,20 +1,42 @@
-import uuid
+import itertools
+import numpy as np
 import pandas as pd
-from overfitting.types import OrderType
+from typing import Optional
+from overfitting.types import OrderType, TimeInForce
+
+# Orders keep raw int64 ns stamps; records expose them under their public
+# names as pd.Timestamp, built only when a record is materialized.
+_RECORD_KEYS = {"created_ns": "created_at", "executed_ns": "executed_at"}
+
+# Ids for orders built outside a Broker (each Broker numbers its own orders)
+_ids = itertools.count(1)
 
 class Order:
+    __slots__ = (
+        "id", "created_ns", "executed_ns", "symbol", "side", "qty", "price", "type",
+        "stop_price", "is_triggered", "is_liquidation_order", "theoretical_price",
+        "executed_price", "commission", "pnl", "realized_pnl", "label", "created_i",
+        "oco", "trail", "trail_percent", "time_in_force", "expire_i",
+    )
+
     def __init__(self, 
-                 time: pd.Timestamp, 
+                 time: int, 
                  symbol: str, 
                  qty: float, 
                  price:float, 
                  type: OrderType, 
                  stop_price: float = None,
-                 label: str= None):
-        
-        self.id = uuid.uuid4().hex[:16]
-        self.created_at = time
-        self.executed_at = None
+                 label: str= None,
+                 i: int = -1,
+                 id: int = None):
+        """
+        :param int time: creation time as int64 ns since epoch (a timestamp is also accepted)
+        :param int i: bar index the order was created at
+        :param int id: order id, monotonic per Broker so runs are reproducible
+        """
+        self.id = next(_ids) if id is None else id
+        self.created_ns = int(time) if isinstance(time, (int, np.integer)) else pd.Timestamp(time).value
+        self.executed_ns = None
         self.symbol = symbol
         self.side = "LONG" if qty > 0 else "SHORT"
         self.qty = qty
@@ -29,9 +51,23 @@ class Order:
         self.pnl = 0
         self.realized_pnl = 0
         self.label = label
+        self.created_i = i
+        self.oco = None            # OCO group id (see Broker.oco)
+        self.trail = None          # trailing distance (see Broker.trailing_stop)
+        self.trail_percent = False
+        self.time_in_force = TimeInForce.GTC
+        self.expire_i = None       # first bar index the order is no longer live
+
+    @property
+    def created_at(self) -> pd.Timestamp:
+        return pd.Timestamp(self.created_ns)
+
+    @property
+    def executed_at(self) -> Optional[pd.Timestamp]:
+        return None if self.executed_ns is None else pd.Timestamp(self.executed_ns)
 
     def __repr__(self):
-        return (f"Order(id={self.id}"
+        return (f"Order(id={self.id}, "
                 f"created_at={self.created_at}, "
                 f"exeucted_at={self.executed_at}, "
                 f"symbol={self.symbol}, "
@@ -49,9 +85,11 @@ class Order:
                 f"label={self.label})")
 
     def to_dict(self):
+        """Trade record; created_at / executed_at as pd.Timestamp (executed_at None until filled)."""
         return {
-            k: (v.name if isinstance(v, OrderType) else v)
-            for k, v in self.__dict__.items()
+            k: (v.name if isinstance(v, (OrderType, TimeInForce)) else v)
+            for k, v in ((k, getattr(self, k)) for k in (_RECORD_KEYS.get(k, k) for k in self.__slots__))
+            if k not in ("created_i", "oco", "trail", "trail_percent", "expire_i")
         }
 
         
\ No newline at end of file
@@ -2,6 +2,11 @@ from math import copysign
 from overfitting.order import Order
 
 class Position:
+    __slots__ = (
+        "symbol", "qty", "price", "liquid_price", "margin",
+        "leverage", "maint_margin_rate", "maint_amount",
+    )
+
     def __init__(self, 
                  symbol:str =None, 
                  maint_margin_rate:float=0.005, 
@@ -0,0 +1,134 @@
+import os
+import json
+import numpy as np
+from typing import Dict, Optional
+from overfitting.errors import InitializationError
+
+# Columnar on-disk store layout:
+#   <path>/meta.json       {"version", "index", "n", "columns": {name: dtype}, "attrs"}
+#   <path>/<column>.bin    raw column values, one file per column
+#
+# Column files are opened with np.memmap so every process reading the same
+# store shares the OS page cache instead of holding its own copy.
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+def _column_file(path: str, name: str) -> str:
+    return os.path.join(path, f"{name}.bin")
+
+def _as_storable(a: np.ndarray) -> np.ndarray:
+    a = np.asarray(a)
+    if a.dtype == object:
+        # Strings / mixed objects -> fixed width unicode so they can be mapped
+        a = a.astype(str)
+    if a.dtype.kind not in "biufMmUS":
+        raise InitializationError(f"Column dtype {a.dtype} cannot be stored.")
+    return np.ascontiguousarray(a)
+
+
+class ColumnStoreWriter:
+    """
+    Appends column chunks to a store directory. Metadata is written on close(),
+    so histories larger than RAM can be written chunk by chunk.
+
+    Usage:
+        with ColumnStoreWriter(path) as w:
+            for chunk in chunks:
+                w.append({"timestamp": ts, "open": o, ...})
+    """
+
+    def __init__(self, path: str, index: str = "timestamp", attrs: Optional[dict] = None):
+        self.path = path
+        self.index = index
+        self.attrs = dict(attrs or {})
+        self.n = 0
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._files = {}
+        os.makedirs(path, exist_ok=True)
+
+    def append(self, columns: Dict[str, np.ndarray]):
+        if self.index not in columns:
+            raise InitializationError(f"Missing index column '{self.index}'.")
+
+        arrays = {k: _as_storable(v) for k, v in columns.items()}
+        lengths = {len(v) for v in arrays.values()}
+        if len(lengths) != 1:
+            raise InitializationError("All columns in a chunk must have the same length.")
+
+        if not self._dtypes:
+            bad = [k for k in arrays if not k or os.sep in k]
+            if bad:
+                raise InitializationError(f"Column names {bad} cannot be used as file names.")
+            self._dtypes = {k: v.dtype for k, v in arrays.items()}
+            self._files = {k: open(_column_file(self.path, k), "wb") for k in arrays}
+        elif set(arrays) != set(self._dtypes):
+            raise InitializationError(
+                f"Chunk columns {sorted(arrays)} differ from store columns {sorted(self._dtypes)}.")
+
+        for k, a in arrays.items():
+            dt = self._dtypes[k]
+            if a.dtype.kind in "US" and a.dtype.itemsize > dt.itemsize:
+                raise InitializationError(f"Column '{k}' has values wider than {dt}.")
+            self._files[k].write(a.astype(dt, copy=False).tobytes())
+
+        self.n += lengths.pop()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "index": self.index,
+            "n": self.n,
+            "columns": {k: v.str for k, v in self._dtypes.items()},
+            "attrs": self.attrs,
+        }
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_store(path: str, columns: Dict[str, np.ndarray], index: str = "timestamp", attrs: Optional[dict] = None):
+    with ColumnStoreWriter(path, index=index, attrs=attrs) as w:
+        w.append(columns)
+
+
+def read_meta(path: str) -> dict:
+    meta_path = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_path):
+        raise InitializationError(f"No column store found at '{path}'.")
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    if meta.get("version") != FORMAT_VERSION:
+        raise InitializationError(f"Unsupported store version {meta.get('version')} at '{path}'.")
+    return meta
+
+
+def open_column(path: str, meta: dict, name: str, mmap: bool = True) -> np.ndarray:
+    """Open a single column, read-only. Zero-copy when mmap=True."""
+    dtype = np.dtype(meta["columns"][name])
+    n = meta["n"]
+    if n == 0:
+        return np.empty(0, dtype=dtype)
+
+    if mmap:
+        return np.memmap(_column_file(path, name), dtype=dtype, mode="r", shape=(n,))
+
+    a = np.fromfile(_column_file(path, name), dtype=dtype, count=n)
+    a.flags.writeable = False
+    return a
+
+
+def open_store(path: str, mmap: bool = True):
+    """Returns (meta, {column: array}) for every column in the store."""
+    meta = read_meta(path)
+    return meta, {c: open_column(path, meta, c, mmap) for c in meta["columns"]}
@@ -1,18 +1,23 @@
 import os
+import tempfile
 import pandas as pd
 import numpy as np
 from abc import abstractmethod
 from typing import List, Optional, Union, Dict
 from overfitting.data import Data, MultiCurrency
+from overfitting.chunked import ChunkedData
 from overfitting.broker import Broker
+from overfitting.checkpoint import Checkpoint
 from overfitting.order import Order
 from overfitting.position import Position
+from overfitting.types import OrderType, TimeInForce
 from overfitting.analysis.report import Report
 from overfitting.slippage import SlippageModel
+from overfitting.errors import CheckpointError
 
 class Strategy:
     def __init__(self, 
-                 data: Union[pd.DataFrame, Dict[str, pd.DataFrame]], 
+                 data: Union[pd.DataFrame, Dict[str, pd.DataFrame], Data, MultiCurrency, ChunkedData], 
                  *,
                  benchmark: Optional[pd.DataFrame] = None,
                  initial_capital: float =100000,
@@ -22,7 +27,10 @@ class Strategy:
                  slippage_model: Optional[SlippageModel] = None):
         
         self.benchmark = benchmark
-        self.data = MultiCurrency(data) if isinstance(data, dict) else Data(data)
+        if isinstance(data, (Data, MultiCurrency, ChunkedData)):
+            self.data = data
+        else:
+            self.data = MultiCurrency(data) if isinstance(data, dict) else Data(data)
         self.broker = Broker(
             data=self.data, 
             cash=initial_capital, 
@@ -31,8 +39,10 @@ class Strategy:
             maint_amount=maint_amount,
             slippage_model=slippage_model
         )
-        self.balances = []
-        self.returns= []
+        self.balances = np.zeros(0)
+        self.returns = np.zeros(0)
+        self.equity_curve: Optional[pd.DataFrame] = None
+        self._curve: Optional[np.ndarray] = None  # cash, equity, margin_used, exposure, returns per bar
         self.init()
 
     def __repr__(self):
@@ -57,11 +67,69 @@ class Strategy:
         within the `run` method.
         """
 
-    def limit_order(self, symbol: str, qty: float, price: float, label: Optional[str] = None) -> Order:
-        return self.broker.order(symbol, qty, price, type="LIMIT", label=label)
+    def get_state(self):
+        """
+        Returns the strategy's own state to store in checkpoints (must be
+        picklable), e.g. counters or an RNG. Override with set_state.
+        """
+        return None
+
+    def set_state(self, state):
+        """
+        Restores what get_state returned when the checkpoint was taken.
+        """
+
+    def checkpoint(self) -> Checkpoint:
+        """
+        Snapshot of the broker, get_state() and the account recorded so far,
+        between two bars.
+        Usage: self.run(stop=n); cp = self.checkpoint()
+               for each scenario: self.restore(cp); self.run(start=cp.i)
+        """
+        i, curve = self.broker._i, None
+        if i and self._curve is not None:
+            curve = self._new_curve(i)
+            curve[:] = self._curve[:, :i]
+        return self.broker.checkpoint(user=self.get_state(), curve=curve)
+
+    def restore(self, checkpoint: Checkpoint):
+        """
+        Rewinds to a checkpoint of this strategy, or continues one taken by
+        another strategy over data with the same symbols and the same bars
+        up to checkpoint.i (e.g. a stress path that diverges after it).
+        Orders and positions held from before are stale afterwards.
+        """
+        i = checkpoint.i
+        if i and checkpoint.curve is None:
+            raise CheckpointError("Checkpoint has no recorded account; take it with Strategy.checkpoint().")
+        self.broker.restore(checkpoint)
+
+        # Fresh curve: outputs of earlier runs are left as they were
+        self._curve = self._new_curve(len(self.data.index))
+        if i:
+            self._curve[:, :i] = checkpoint.curve
+        self.set_state(checkpoint.user)
+
+    def limit_order(
+        self,
+        symbol: str,
+        qty: float,
+        price: float,
+        label: Optional[str] = None,
+        *,
+        time_in_force: Union[str, TimeInForce] = TimeInForce.GTC,
+        expire_at=None,
+        expire_bars: Optional[int] = None,
+    ) -> Order:
+        """
+        time_in_force: 'GTC', 'GTD' (with expire_at), 'GTB' (with expire_bars),
+        'IOC' or 'FOK' (fill on this bar or expire). See Broker.order.
+        """
+        return self.broker.order(symbol, qty, price, type=OrderType.LIMIT, label=label,
+                                 time_in_force=time_in_force, expire_at=expire_at, expire_bars=expire_bars)
 
     def market_order(self, symbol: str, qty: float, label: Optional[str] = None) -> Order:
-        return self.broker.order(symbol, qty, None, type="MARKET", label=label)
+        return self.broker.order(symbol, qty, None, type=OrderType.MARKET, label=label)
 
     def stop_limit_order(
         self,
@@ -70,8 +138,13 @@ class Strategy:
         price: float,
         stop_price: float,
         label: Optional[str] = None,
+        *,
+        time_in_force: Union[str, TimeInForce] = TimeInForce.GTC,
+        expire_at=None,
+        expire_bars: Optional[int] = None,
     ) -> Order:
-        return self.broker.order(symbol, qty, price, type="STOP", stop_price=stop_price, label=label)
+        return self.broker.order(symbol, qty, price, type=OrderType.STOP, stop_price=stop_price, label=label,
+                                 time_in_force=time_in_force, expire_at=expire_at, expire_bars=expire_bars)
 
     def stop_market_order(
         self,
@@ -79,12 +152,89 @@ class Strategy:
         qty: float,
         stop_price: float,
         label: Optional[str] = None,
+        *,
+        time_in_force: Union[str, TimeInForce] = TimeInForce.GTC,
+        expire_at=None,
+        expire_bars: Optional[int] = None,
+    ) -> Order:
+        return self.broker.order(symbol, qty, None, type=OrderType.STOP, stop_price=stop_price, label=label,
+                                 time_in_force=time_in_force, expire_at=expire_at, expire_bars=expire_bars)
+
+    def order_batch(
+        self,
+        symbols: List[str],
+        qtys,
+        prices=None,
+        types: Union[str, OrderType, List[Union[str, OrderType]]] = OrderType.MARKET,
+        stop_prices=None,
+        label: Optional[str] = None,
+    ) -> List[Order]:
+        """
+        Places many orders in one call (MARKET by default), validated as a batch.
+        Usage: self.order_batch(["BTC", "ETH"], [0.1, -2.0])
+        """
+        return self.broker.order_batch(symbols, qtys, prices, types, stop_prices=stop_prices, label=label)
+
+    def rebalance_to_weights(
+        self,
+        weights,
+        symbols: Optional[List[str]] = None,
+        min_notional: float = 0.0,
+        label: Optional[str] = None,
+    ) -> List[Order]:
+        """
+        Market orders moving each symbol to weight * equity of notional.
+        Usage: self.rebalance_to_weights(w)  # w aligned with self.data.symbols
+               self.rebalance_to_weights({"BTC": 0.5, "ETH": -0.5})
+        """
+        return self.broker.rebalance_to_weights(weights, symbols, min_notional=min_notional, label=label)
+
+    def bracket_order(
+        self,
+        symbol: str,
+        qty: float,
+        price: Optional[float] = None,
+        take_profit: Optional[float] = None,
+        stop_loss: Optional[float] = None,
+        label: Optional[str] = None,
+    ) -> Order:
+        """
+        Entry order (LIMIT, or MARKET when price is None). Once it fills, a
+        take-profit limit and a stop-loss stop for the opposite qty are placed
+        as an OCO pair by the broker.
+        """
+        return self.broker.bracket(symbol, qty, price, take_profit=take_profit, stop_loss=stop_loss, label=label)
+
+    def trailing_stop_order(
+        self,
+        symbol: str,
+        qty: float,
+        trail: float,
+        percent: bool = False,
+        label: Optional[str] = None,
     ) -> Order:
-        return self.broker.order(symbol, qty, None, type="STOP", stop_price=stop_price, label=label)
+        """
+        STOP MARKET order trailing the market by `trail` (a fraction when
+        percent=True), updated by the broker from each bar's high / low.
+        """
+        return self.broker.trailing_stop(symbol, qty, trail, percent=percent, label=label)
 
-    def cancel_order(self, symbol, order_id: str) -> Optional[Order]:
+    def oco(self, *orders: Order) -> int:
+        """
+        Links open orders so the first one filled cancels the others.
+        Usage: self.oco(self.limit_order(...), self.stop_market_order(...))
+        """
+        return self.broker.oco(*orders)
+
+    def cancel_order(self, symbol, order_id: int) -> Optional[Order]:
         return self.broker.cancel_order(symbol, order_id)
     
+    def cancel_by_label(self, symbol: str, label: str) -> List[Order]:
+        """
+        Cancel the open orders of a symbol placed with `label`
+        """
+        return self.broker.cancel_by_label(symbol, label)
+
     def cancel_all_orders(self, symbol):
         """
         Cancel all open orders for a specific symbol
@@ -105,6 +255,14 @@ class Strategy:
         """
         self.broker.set_leverage(symbol, leverage)
 
+    def attach_intrabar(self, symbol: str, fine: Union[pd.DataFrame, Data]):
+        """
+        Resolves bars where the fill order is ambiguous (e.g. a stop and a
+        limit both inside the range) on lower-timeframe bars of `symbol`.
+        Usage (in init): self.attach_intrabar("BTC", btc_1m_df)
+        """
+        self.broker.attach_intrabar(symbol, fine)
+
     def get_position(self, symbol: str) -> Position:
         """
         Fetch the current position of a specific symbol
@@ -123,6 +281,24 @@ class Strategy:
         """
         return dict(self.broker.open_orders.get(symbol, {}))
 
+    def get_orders_by_label(self, symbol: str, label: str) -> Dict[int, Order]:
+        """
+        Fetch the open orders of a symbol placed with `label`
+        """
+        return self.broker.get_orders_by_label(symbol, label)
+
+    def get_orders_by_side(self, symbol: str, side: str) -> Dict[int, Order]:
+        """
+        Fetch the open orders of a symbol on one side ('LONG' or 'SHORT')
+        """
+        return self.broker.get_orders_by_side(symbol, side)
+
+    def get_orders_by_type(self, symbol: str, type: Union[str, OrderType]) -> Dict[int, Order]:
+        """
+        Fetch the open orders of a symbol of one type ('LIMIT', 'MARKET' or 'STOP')
+        """
+        return self.broker.get_orders_by_type(symbol, type)
+
     def open(self, symbol: str, i: int):
         return self.broker._open(symbol, i)
     
@@ -135,12 +311,30 @@ class Strategy:
     def close(self, symbol: str, i: int):
         return self.broker._close(symbol, i)
 
+    def tradable(self, symbol: str, i: int) -> bool:
+        """
+        False on synthetic bars created by MultiCurrency(align='ffill'|'mask')
+        """
+        return self.broker._tradable(symbol, i)
+
     def bars(self, symbol: str, i: int) -> tuple:
         """
         Returns Tuple - open, high, low, close
         """
         return self.broker._bars(symbol, i)
 
+    def htf(self, timeframe: str, symbol: Optional[str] = None):
+        """
+        Higher timeframe bars aligned to the base grid (see Data.attach_timeframe).
+        Usage: self.htf("1h").close[i], self.htf("1d", "ETH").high[i]
+        """
+        if symbol is None:
+            if isinstance(self.data, MultiCurrency):
+                raise AttributeError("symbol must be specified for multi currency data.")
+            return self.data.htf(timeframe)
+
+        return self.broker._d(symbol).htf(timeframe)
+
     def val(self, symbol: str, i: int, col: str):
         """
         Fetch the target column from target index
@@ -152,37 +346,76 @@ class Strategy:
         
         return target_column[i]
 
-    def run(self) -> pd.Series:
+    def _new_curve(self, n: int) -> np.ndarray:
+        # Out-of-core runs keep the per-bar account in an unlinked temporary
+        # file paged by the OS instead of RAM
+        if isinstance(self.data, ChunkedData):
+            return np.memmap(tempfile.TemporaryFile(), dtype=np.float64, mode="w+", shape=(5, n))
+        return np.zeros((5, n))
+
+    def run(self, start: int = 0, stop: Optional[int] = None) -> pd.Series:
         """
         Executes the strategy over the dataset.
 
         It handles the iteration over each time period in the data. It calls the 
         user-defined `next` method on each iteration to apply the strategy's logic. 
-        Additionally, it updates account balances, and calculates the returns.
+        Additionally, it records the account marked to market at every bar close
+        (`self.equity_curve`: cash, equity, margin_used, exposure) and
+        calculates the returns from equity, so open positions count.
+
+        Bars [start, stop) are simulated. `stop` ends the run early (e.g. to
+        take a checkpoint); `start` resumes at the bar the broker was
+        restored to (or the previous run stopped at), keeping the account
+        recorded for the earlier bars.
+
+        Outputs are NumPy arrays (`self.balances`, `self.returns`) and
+        frames over them, without per-bar Python objects; with ChunkedData
+        they are backed by a temporary file rather than RAM.
     
         Returns:
-            A pandas Series containing the returns, indexed by the corresponding timestamps.
+            A pandas Series containing the returns up to `stop`, indexed by the corresponding timestamps.
         """
-        t = pd.to_datetime(self.data.index)
-        b = np.zeros(len(t))
-        r = np.zeros(len(t))
+        n = len(self.data.index)
+        stop = n if stop is None else min(stop, n)
+        if start:
+            if self._curve is None or self.broker._i != start:
+                raise CheckpointError(
+                    f"Cannot resume at bar {start}: broker is at bar {self.broker._i}. Restore a checkpoint first.")
+        else:
+            self._curve = self._new_curve(n)
+        b, e, m, x, r = self._curve # cash, equity (cash + unrealized pnl), margin used, gross exposure, returns
+
+        # Out-of-core data is simulated window by window
+        chunked = isinstance(self.data, ChunkedData)
+        windows = self.data.windows(start) if chunked else [(0, n)]
 
-        for i in range(len(t)):
-            self.next(i)
-            self.broker.next()
+        for lo, hi in windows:
+            if lo >= stop:
+                break
+            for i in range(max(lo, start), min(hi, stop)):
+                self.next(i)
+                self.broker.next()
 
-            # Update Balance
-            b[i] = self.broker.cash
+                # Update Balance and marked-to-market account
+                b[i] = self.broker.cash
+                e[i] = self.broker.equity
+                m[i] = self.broker.margin_used
+                x[i] = self.broker.exposure
 
-            if i > 0:
-                # Updates the Returns
-                pb = b[i-1] # previous balance
-                r[i] = (b[i] - pb) / pb
+        # Returns from equity, block by block so no n-sized temporaries are built
+        block = max(1, self.data.chunk_size if chunked else n)
+        r[0] = 0.0
+        for lo in range(max(start, 1), stop, block):
+            hi = min(lo + block, stop)
+            r[lo:hi] = (e[lo:hi] - e[lo - 1:hi - 1]) / e[lo - 1:hi - 1]
 
-        self.balances = b.tolist()
-        self.returns = r.tolist()
+        t = pd.DatetimeIndex(self.data.index[:stop], copy=False)
+        self.balances = b[:stop]
+        self.returns = r[:stop]
+        self.equity_curve = pd.DataFrame(
+            self._curve[:4, :stop].T, index=t, columns=["cash", "equity", "margin_used", "exposure"], copy=False)
 
-        return pd.Series(self.returns, index=t.tolist())
+        return pd.Series(self.returns, index=t, copy=False)
 
     def plot(self, returns: pd.Series, save_path=None, title="Simulation"):
         """
@@ -217,7 +450,7 @@ class Strategy:
         Returns:
             A pandas DataFrame where each row represents a trade.
         """
-        return pd.DataFrame(self.broker.trades)
+        return self.broker.trade_log.to_frame()
     
     def save_trades_to_csv(self, path='', filename="trade_history"):
         """
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple, Union
+from overfitting.data import Data
+from overfitting.errors import InitializationError
+from overfitting.store import ColumnStoreWriter
+
+BAR_KINDS = ("time", "tick", "volume", "dollar")
+TICK_COLUMNS = ("timestamp", "price", "size", "side")
+
+def _side_is_buy(side: np.ndarray) -> np.ndarray:
+    """Aggressor side as a boolean array: > 0 / True / 'buy' / 'b' are buys."""
+    side = np.asarray(side)
+    if side.dtype.kind == "b":
+        return side
+    if side.dtype.kind in "iuf":
+        return side > 0
+    return np.char.startswith(np.char.lower(side.astype(str)), "b")
+
+
+class BarAggregator:
+    """
+    Streaming tick / trade-print -> bar aggregation.
+
+    Every update() is one vectorized pass over its chunk; only the ticks of
+    the last (still open) bar are carried to the next chunk, so memory stays
+    bounded by the chunk size.
+
+    kind / every:
+        - 'time':   every is a duration ('1min', '5s') -> epoch aligned time bars
+        - 'tick':   every N trades
+        - 'volume': every N units of size traded
+        - 'dollar': every N of price * size traded
+
+    Emitted columns: timestamp, open, high, low, close, volume, vwap, trades
+    and buy_volume / sell_volume when sides are given.
+
+    Usage:
+        agg = BarAggregator("volume", 1_000)
+        for chunk in chunks:
+            bars = agg.update(chunk.timestamp, chunk.price, chunk.size, chunk.side)
+        last = agg.flush()
+    """
+
+    def __init__(self, kind: str = "time", every: Union[str, int, float] = "1min"):
+        if kind not in BAR_KINDS:
+            raise InitializationError(f"kind must be one of {BAR_KINDS} - {kind}")
+
+        self.kind = kind
+        self.every = pd.Timedelta(every).value if kind == "time" else every
+        if self.every <= 0:
+            raise InitializationError(f"every must be > 0 - {every}")
+
+        self._carry: Optional[Dict[str, np.ndarray]] = None
+        self._sided: Optional[bool] = None  # fixed by the first update()
+        self._flow = 0.0                    # volume / dollar traded before the carried ticks
+
+    def __repr__(self):
+        return (f"BarAggregator("
+                f"kind={self.kind}, "
+                f"every={self.every})")
+
+    def _keys(self, t: np.ndarray, p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Bar number of every tick, plus the running flow total for volume /
+        dollar bars. Those bars close each time the total traded flow crosses a
+        multiple of `every`, so boundaries do not depend on how input is chunked.
+        """
+        if self.kind == "time":
+            return t // self.every, None
+        if self.kind == "tick":
+            return np.arange(len(t)) // self.every, None
+
+        flow = q if self.kind == "volume" else p * q
+        cum = np.cumsum(np.r_[self._flow, flow])  # one sequential sum, same as an unchunked run
+        return (cum[:-1] // self.every).astype(np.int64), cum
+
+    def update(self, timestamp, price, size, side=None) -> Dict[str, np.ndarray]:
+        """Feeds one chunk of ticks and returns the bars completed by it."""
+        t = np.asarray(timestamp)
+        t = (t.astype("datetime64[ns]") if t.dtype.kind == "M" else t.astype(np.int64)).view("i8")
+        chunk = {
+            "t": t,
+            "p": np.asarray(price, dtype=np.float64),
+            "q": np.asarray(size, dtype=np.float64),
+        }
+        if self._sided is None:
+            self._sided = side is not None
+        if self._sided != (side is not None):
+            raise InitializationError("side must be given for every chunk or for none.")
+        if side is not None:
+            chunk["buy"] = _side_is_buy(side)
+
+        if self._carry is not None:
+            chunk = {k: np.concatenate([self._carry[k], chunk[k]]) for k in chunk}
+            self._carry = None
+
+        n = len(chunk["t"])
+        if n == 0:
+            return self._bars(chunk, np.empty(0, dtype=np.int64), 0)
+
+        keys, cum = self._keys(chunk["t"], chunk["p"], chunk["q"])
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+        # Hold back the last bar unless it is already complete
+        # (time bars never are until a later tick arrives)
+        last = starts[-1]
+        if self.kind == "tick":
+            complete = n - last >= self.every
+        elif cum is not None:
+            complete = cum[-1] // self.every > keys[-1]
+        else:
+            complete = False
+
+        if not complete:
+            self._carry = {k: v[last:] for k, v in chunk.items()}
+            starts, n = starts[:-1], last
+        if cum is not None:
+            self._flow = cum[n]
+
+        return self._bars(chunk, starts, n, keys)
+
+    def flush(self) -> Dict[str, np.ndarray]:
+        """Returns the last (partial) bar and resets the aggregator."""
+        chunk, self._carry = self._carry, None
+        if chunk is None:
+            empty = {"t": np.empty(0, np.int64), "p": np.empty(0), "q": np.empty(0)}
+            if self._sided:
+                empty["buy"] = np.empty(0, dtype=bool)
+            return self._bars(empty, np.empty(0, dtype=np.int64), 0)
+
+        keys, _ = self._keys(chunk["t"], chunk["p"], chunk["q"])
+        self._flow = 0.0
+        return self._bars(chunk, np.zeros(1, dtype=np.int64), len(chunk["t"]), keys)
+
+    def _bars(self, chunk: Dict[str, np.ndarray], starts: np.ndarray, n: int, keys=None) -> Dict[str, np.ndarray]:
+        t, p, q = chunk["t"][:n], chunk["p"][:n], chunk["q"][:n]
+
+        if len(starts) == 0:
+            bars = {c: np.empty(0, dtype=np.float64) for c in ("open", "high", "low", "close", "volume", "vwap")}
+            bars["timestamp"] = np.empty(0, dtype="datetime64[ns]")
+            bars["trades"] = np.empty(0, dtype=np.int64)
+            if "buy" in chunk:
+                bars["buy_volume"] = bars["sell_volume"] = np.empty(0, dtype=np.float64)
+            return bars
+
+        ends = np.r_[starts[1:], n] - 1
+        if self.kind == "time":
+            stamp = keys[starts] * self.every  # bucket open time
+        else:
+            stamp = t[starts]                  # first trade of the bar
+
+        volume = np.add.reduceat(q, starts)
+        bars = {
+            "timestamp": stamp.view("datetime64[ns]"),
+            "open": p[starts],
+            "high": np.maximum.reduceat(p, starts),
+            "low": np.minimum.reduceat(p, starts),
+            "close": p[ends],
+            "volume": volume,
+            "vwap": np.add.reduceat(p * q, starts) / np.where(volume == 0, np.nan, volume),
+            "trades": ends - starts + 1,
+        }
+        if "buy" in chunk:
+            buy = np.add.reduceat(np.where(chunk["buy"][:n], q, 0.0), starts)
+            bars["buy_volume"] = buy
+            bars["sell_volume"] = volume - buy
+        return bars
+
+
+def _normalize_ticks(df: pd.DataFrame, columns: Optional[Dict[str, str]]):
+    names = {c: c for c in TICK_COLUMNS}
+    names.update(columns or {})
+
+    missing = [names[c] for c in ("timestamp", "price", "size") if names[c] not in df.columns]
+    if missing:
+        raise InitializationError(f"Missing tick columns: {missing}. Available: {list(df.columns)}")
+
+    ts = Data._to_datetime_ns(df[names["timestamp"]]).to_numpy()
+    side = df[names["side"]].to_numpy() if names["side"] in df.columns else None
+    return ts, df[names["price"]].to_numpy(), df[names["size"]].to_numpy(), side
+
+
+def aggregate_ticks(df: pd.DataFrame,
+                    kind: str = "time",
+                    every: Union[str, int, float] = "1min",
+                    columns: Optional[Dict[str, str]] = None) -> Data:
+    """
+    In-memory tick -> bar aggregation.
+    :param dict columns: rename map {'timestamp'|'price'|'size'|'side': source column}
+    """
+    agg = BarAggregator(kind, every)
+    parts = [agg.update(*_normalize_ticks(df, columns)), agg.flush()]
+    bars = {k: np.concatenate([part[k] for part in parts]) for k in parts[0]}
+    return Data(pd.DataFrame(bars))
+
+
+def aggregate_csv(csv_path: str,
+                  store_path: str,
+                  kind: str = "time",
+                  every: Union[str, int, float] = "1min",
+                  columns: Optional[Dict[str, str]] = None,
+                  chunksize: int = 5_000_000) -> Data:
+    """
+    Streams a tick CSV larger than RAM chunk by chunk into a columnar bar
+    store and opens the result (memory-mapped) as Data.
+    """
+    agg = BarAggregator(kind, every)
+    with ColumnStoreWriter(store_path) as w:
+        for df in pd.read_csv(csv_path, chunksize=chunksize):
+            w.append(agg.update(*_normalize_ticks(df, columns)))
+        w.append(agg.flush())
+
+    return Data.load(store_path)
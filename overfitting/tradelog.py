@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from typing import Dict, List
+from overfitting.order import Order
+from overfitting.types import Status
+
+# Record field -> storage. "category" fields are dictionary-encoded
+# (int32 codes, -1 for None); "ns" fields are int64 ns since epoch.
+FIELDS = {
+    "id": "i8",
+    "created_at": "ns",
+    "executed_at": "ns",
+    "symbol": "category",
+    "side": "category",
+    "qty": "f8",
+    "price": "f8",
+    "type": "category",
+    "status": "category",
+    "stop_price": "f8",
+    "is_triggered": "?",
+    "is_liquidation_order": "?",
+    "theoretical_price": "f8",
+    "executed_price": "f8",
+    "commission": "f8",
+    "pnl": "f8",
+    "realized_pnl": "f8",
+    "label": "category",
+}
+# Optional prices are stored as NaN and come back as None in records
+NULLABLE = ("price", "stop_price")
+
+class _Dictionary:
+    """Value <-> int32 code mapping of a dictionary-encoded field."""
+
+    def __init__(self):
+        self.codes: Dict[object, int] = {}
+        self.values: List[object] = []
+
+    def encode(self, value) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class TradeLog:
+    """
+    Fills stored column-wise in growable typed NumPy arrays (capacity doubles
+    when full), instead of one dict per fill.
+
+    - to_frame() / to_arrow() build tables over views of the arrays
+    - records() is the list-of-dicts view behind Broker.trades
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.n = 0
+        self._capacity = max(1, capacity)
+        self._cols: Dict[str, np.ndarray] = {
+            f: np.empty(self._capacity, dtype=(np.int32 if kind == "category" else
+                                                np.int64 if kind == "ns" else kind))
+            for f, kind in FIELDS.items()
+        }
+        self._dicts: Dict[str, _Dictionary] = {f: _Dictionary() for f, kind in FIELDS.items() if kind == "category"}
+
+    def __repr__(self):
+        return (f"TradeLog("
+                f"n={self.n}, "
+                f"capacity={self._capacity})")
+
+    def __len__(self):
+        return self.n
+
+    def __getstate__(self):
+        # Only the logged rows are pickled (e.g. into a Checkpoint)
+        return {"n": self.n,
+                "cols": {f: a[:self.n] for f, a in self._cols.items()},
+                "dicts": {f: d.values for f, d in self._dicts.items()}}
+
+    def __setstate__(self, state):
+        # Fresh buffers: frames taken from the pickled log never see later fills
+        n = state["n"]
+        self.__init__(max(1024, 2 * n))
+        for f, a in state["cols"].items():
+            self._cols[f][:n] = a
+        for f, values in state["dicts"].items():
+            for value in values:
+                self._dicts[f].encode(value)
+        self.n = n
+
+    def _grow(self):
+        self._capacity *= 2
+        for f, a in self._cols.items():
+            grown = np.empty(self._capacity, dtype=a.dtype)
+            grown[:self.n] = a[:self.n]
+            self._cols[f] = grown
+
+    def append(self, order: Order, status: Status = Status.FILLED):
+        if self.n == self._capacity:
+            self._grow()
+
+        i, c, d = self.n, self._cols, self._dicts
+        c["id"][i] = order.id
+        c["created_at"][i] = order.created_ns
+        c["executed_at"][i] = order.executed_ns
+        c["symbol"][i] = d["symbol"].encode(order.symbol)
+        c["side"][i] = d["side"].encode(order.side)
+        c["qty"][i] = order.qty
+        c["price"][i] = np.nan if order.price is None else order.price
+        c["type"][i] = d["type"].encode(order.type.name)
+        c["status"][i] = d["status"].encode(status.name)
+        c["stop_price"][i] = np.nan if order.stop_price is None else order.stop_price
+        c["is_triggered"][i] = order.is_triggered
+        c["is_liquidation_order"][i] = order.is_liquidation_order
+        c["theoretical_price"][i] = order.theoretical_price
+        c["executed_price"][i] = order.executed_price
+        c["commission"][i] = order.commission
+        c["pnl"][i] = order.pnl
+        c["realized_pnl"][i] = order.realized_pnl
+        c["label"][i] = d["label"].encode(order.label)
+        self.n += 1
+
+    def column(self, field: str) -> np.ndarray:
+        """Raw storage of a field (codes for dictionary-encoded fields), as a view."""
+        return self._cols[field][:self.n]
+
+    def record(self, i: int) -> dict:
+        """One fill as the dict Order.to_dict() produces (timestamps as pd.Timestamp)."""
+        out = {}
+        for f, kind in FIELDS.items():
+            v = self._cols[f][i]
+            if kind == "category":
+                out[f] = None if v < 0 else self._dicts[f].values[v]
+            elif kind == "ns":
+                out[f] = pd.Timestamp(int(v))
+            elif f in NULLABLE and v != v:
+                out[f] = None
+            else:
+                out[f] = v.item()
+        return out
+
+    def records(self) -> "TradeRecords":
+        return TradeRecords(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame over views of the log's arrays: timestamps as datetime64[ns],
+        dictionary-encoded fields as pd.Categorical sharing the code arrays.
+        """
+        cols = {}
+        for f, kind in FIELDS.items():
+            a = self.column(f)
+            if kind == "category":
+                cols[f] = pd.Categorical.from_codes(a, categories=pd.Index(self._dicts[f].values, dtype=object))
+            elif kind == "ns":
+                cols[f] = a.view("datetime64[ns]")
+            else:
+                cols[f] = a
+        return pd.DataFrame(cols, copy=False)
+
+    def to_arrow(self):
+        """pyarrow.Table over the log's buffers (requires the optional pyarrow package)."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("TradeLog.to_arrow() requires pyarrow: pip install overfitting[arrow]") from e
+
+        arrays = []
+        for f, kind in FIELDS.items():
+            a = self.column(f)
+            if kind == "category":
+                dictionary = pa.array(self._dicts[f].values, type=pa.string())
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(a, mask=a < 0), dictionary))
+            elif kind == "ns":
+                arrays.append(pa.array(a.view("datetime64[ns]")))
+            else:
+                arrays.append(pa.array(a))
+        return pa.Table.from_arrays(arrays, names=list(FIELDS))
+
+
+class TradeRecords(Sequence):
+    """
+    Lazy list-of-dicts view of a TradeLog (what Broker.trades used to be).
+    Dicts are built only for the fills that are accessed.
+    """
+
+    def __init__(self, log: TradeLog):
+        self._log = log
+
+    def __repr__(self):
+        return f"TradeRecords(n={len(self._log)})"
+
+    def __len__(self):
+        return len(self._log)
+
+    def __getitem__(self, i):
+        n = len(self._log)
+        if isinstance(i, slice):
+            return [self._log.record(j) for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("trade index out of range")
+        return self._log.record(i)
+
+    def to_frame(self) -> pd.DataFrame:
+        return self._log.to_frame()
@@ -8,4 +8,12 @@ class OrderType(Enum):
 class Status(Enum):
     OPEN = 0
     FILLED = 1
-    REJECTED = 2
\ No newline at end of file
+    REJECTED = 2
+    EXPIRED = 3
+
+class TimeInForce(Enum):
+    GTC = 0  # good till cancelled
+    GTD = 1  # good till date (expire_at)
+    IOC = 2  # immediate or cancel
+    FOK = 3  # fill or kill
+    GTB = 4  # good for N bars (expire_bars)
\ No newline at end of file